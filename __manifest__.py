@@ -1,6 +1,6 @@
 {
     'name': 'Forms Dashboard',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.3.0',
     'category': 'Website',
     'summary': 'Dashboard for Website Form Submissions',
     'description': """
@@ -13,6 +13,7 @@
     'depends': [
         'base',
         'web',
+        'bus',
         'website',
         'mail',
     ],
@@ -20,19 +21,23 @@
         'security/forms_dashboard_security.xml',
         'security/ir.model.access.csv',
         'data/sequence_data.xml',
+        'data/cron_data.xml',
         'views/activity_views.xml',
         'views/partnership_views.xml',
         'views/donation_views.xml',
         'views/collaboration_views.xml',
         'views/dashboard_views.xml',
+        'views/intake_queue_views.xml',
+        'views/inquiry_report_views.xml',
         'views/form_response_templates.xml', 
         'views/menu_views.xml',
     ],
     'assets': {
         'web.assets_backend': [
-            'https://cdn.jsdelivr.net/npm/chart.js@3.7.0/dist/chart.min.js',
+            'forms_dashboard/static/src/js/activity_table.js',
             'forms_dashboard/static/src/js/dashboard.js',
             'forms_dashboard/static/src/css/dashboard.css',
+            'forms_dashboard/static/src/xml/activity_table.xml',
             'forms_dashboard/static/src/xml/dashboard.xml', 
         ],
     },
@@ -0,0 +1,227 @@
+from odoo import http, fields, api
+from odoo.http import request, content_disposition
+from datetime import date, datetime
+import csv
+import io
+import logging
+import os
+import tempfile
+import zlib
+
+_logger = logging.getLogger(__name__)
+
+# Rows read from the database per query
+EXPORT_CHUNK_SIZE = 2000
+
+# Bytes sent per HTTP chunk when streaming a file from disk
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Largest number of data rows on one XLSX worksheet
+XLSX_MAX_ROWS = 1048575
+
+# Columns shared by every inquiry type: (header, field)
+COMMON_COLUMNS = [
+    ('Reference', 'name'),
+    ('Status', 'state'),
+    ('Source', 'source'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Submission Date (UTC)', 'date_submitted'),
+    ('Created On (UTC)', 'create_date'),
+]
+
+# Type-specific columns: (model, type label, [(header, field), ...])
+EXPORT_MODELS = [
+    ('partnership.inquiry', 'Partnership', [
+        ('Company Name', 'company_name'),
+        ('Contact Person', 'contact_person'),
+        ('Partnership Type', 'partnership_type'),
+        ('Company Size', 'company_size'),
+        ('Industry', 'industry'),
+        ('Partnership Goals', 'goals'),
+    ]),
+    ('donation.inquiry', 'Donation', [
+        ('Donor Name', 'donor_name'),
+        ('Donation Type', 'donation_type'),
+        ('Amount Range', 'amount_range'),
+        ('Recognition', 'recognition'),
+        ('Interest Areas', 'interest_areas'),
+        ('Actual Amount', 'actual_amount'),
+        ('Payment Date', 'payment_date'),
+    ]),
+    ('collaboration.inquiry', 'Collaboration', [
+        ('Institution Name', 'institution_name'),
+        ('Contact Name', 'contact_name'),
+        ('Collaboration Type', 'collaboration_type'),
+        ('Institution Type', 'institution_type'),
+        ('Country/Region', 'country'),
+        ('Collaboration Scope', 'scope'),
+        ('Start Date', 'start_date'),
+        ('End Date', 'end_date'),
+    ]),
+]
+
+
+def export_headers():
+    headers = ['Type'] + [header for header, field in COMMON_COLUMNS]
+    for model, label, columns in EXPORT_MODELS:
+        headers += [header for header, field in columns]
+    return headers
+
+
+def export_rows(registry, uid, context, filters):
+    """ Yield one list per inquiry matching the dashboard filters
+
+    Runs on its own cursor, since the response body is produced after the
+    request cursor is closed. Records are read in fixed-size chunks on the
+    id order and the cache is dropped after each chunk, so memory stays flat
+    whatever the number of rows.
+    """
+    specific_count = sum(len(columns) for model, label, columns in EXPORT_MODELS)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        domain = env['forms.dashboard']._get_filter_domain(**filters)
+        before = 0
+        for model, label, columns in EXPORT_MODELS:
+            Inquiry = env[model]
+            field_names = [field for header, field in COMMON_COLUMNS + columns]
+            selections = {
+                name: dict(Inquiry._fields[name]._description_selection(env))
+                for name in field_names if Inquiry._fields[name].type == 'selection'
+            }
+            # The other types' columns are left empty
+            empty_before = [''] * before
+            empty_after = [''] * (specific_count - before - len(columns))
+            last_id = 0
+            while True:
+                records = Inquiry.search_fetch(
+                    domain + [('id', '>', last_id)], field_names,
+                    limit=EXPORT_CHUNK_SIZE, order='id',
+                )
+                if not records:
+                    break
+                for record in records:
+                    yield (
+                        [label]
+                        + [_export_value(record, name, selections) for header, name in COMMON_COLUMNS]
+                        + empty_before
+                        + [_export_value(record, name, selections) for header, name in columns]
+                        + empty_after
+                    )
+                last_id = records[-1].id
+                env.invalidate_all()
+            before += len(columns)
+
+
+def _export_value(record, name, selections):
+    value = record[name]
+    if name in selections:
+        return selections[name].get(value, value or '')
+    if value is False or value is None:
+        return ''
+    if isinstance(value, datetime):
+        return fields.Datetime.to_string(value)
+    if isinstance(value, date):
+        return fields.Date.to_string(value)
+    return value
+
+
+def stream_csv(rows, compress=False):
+    """ Encode rows as CSV, one HTTP chunk per batch of rows """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text):
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor else data
+
+    buffer.write('\ufeff')
+    writer.writerow(export_headers())
+    for index, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if index % EXPORT_CHUNK_SIZE == 0:
+            chunk = encode(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            if chunk:
+                yield chunk
+    chunk = encode(buffer.getvalue())
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def stream_xlsx(rows):
+    """ Write rows to a constant-memory workbook on disk, then stream it """
+    import xlsxwriter
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        bold = workbook.add_format({'bold': True})
+        headers = export_headers()
+        sheet, row_index = None, XLSX_MAX_ROWS
+        for row in rows:
+            if row_index >= XLSX_MAX_ROWS:
+                sheet = workbook.add_worksheet()
+                sheet.write_row(0, 0, headers, bold)
+                row_index = 0
+            row_index += 1
+            sheet.write_row(row_index, 0, row)
+        if sheet is None:
+            workbook.add_worksheet().write_row(0, 0, headers, bold)
+        workbook.close()
+
+        with open(path, 'rb') as xlsx_file:
+            while True:
+                block = xlsx_file.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                yield block
+    finally:
+        os.unlink(path)
+
+
+class FormsDashboardExport(http.Controller):
+
+    @http.route('/forms_dashboard/export', type='http', auth="user", methods=['GET'])
+    def export_inquiries(self, date_range='all', date_from=None, date_to=None, status='all',
+                         format='csv', compress=None, **kwargs):
+        filters = {
+            'date_range': date_range,
+            'date_from': date_from,
+            'date_to': date_to,
+            'status': status,
+        }
+        # Fail fast on bad filters and access errors while the request can still report them
+        request.env['forms.dashboard']._get_filter_domain(**filters)
+        for model, label, columns in EXPORT_MODELS:
+            request.env[model].check_access('read')
+
+        rows = export_rows(request.env.registry, request.env.uid, dict(request.env.context), filters)
+        timestamp = fields.Datetime.now().strftime('%Y%m%d-%H%M%S')
+        _logger.info("Inquiry export started by user %s with filters %s", request.env.uid, filters)
+
+        if format == 'xlsx':
+            body = stream_xlsx(rows)
+            filename = f'forms-dashboard-export-{timestamp}.xlsx'
+            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        elif compress:
+            body = stream_csv(rows, compress=True)
+            filename = f'forms-dashboard-export-{timestamp}.csv.gz'
+            content_type = 'application/gzip'
+        else:
+            body = stream_csv(rows)
+            filename = f'forms-dashboard-export-{timestamp}.csv'
+            content_type = 'text/csv; charset=utf-8'
+
+        response = request.make_response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', content_disposition(filename)),
+            ('Cache-Control', 'no-store'),
+        ])
+        response.direct_passthrough = True
+        return response
@@ -2,115 +2,191 @@ from odoo import http
 from odoo.http import request
 import logging
 
+from ..models.endpoint_metrics import instrumented
+
 _logger = logging.getLogger(__name__)
 
+# Payloads inserted per create() call by the batch API
+API_CHUNK_SIZE = 500
+
+# Largest number of payloads accepted in one batch API request
+API_MAX_ITEMS = 10000
+
+# Chatter note logged on inquiries created through the batch API
+IMPORT_SUMMARY = 'Imported via API'
+
 class FormsDashboard(http.Controller):
-    
-    @http.route('/website_form/partnership.inquiry', type='http', auth="public", methods=['POST'], website=True, csrf=False)
-    def create_partnership_inquiry(self, **kwargs):
-        _logger.info("Partnership form submitted with data: %s", kwargs)
-        
+
+    def _prepare_partnership_vals(self, data):
+        vals = {
+            'company_name': data.get('company_name', ''),
+            'contact_person': data.get('contact_person', ''),
+            'email': data.get('email', ''),
+            'phone': data.get('phone', ''),
+            'partnership_type': data.get('partnership_type', ''),
+            'company_size': data.get('company_size', ''),
+            'industry': data.get('industry', ''),
+            'goals': data.get('partnership_goals', ''),
+            'source': 'website'
+        }
+        # Remove empty values
+        return {k: v for k, v in vals.items() if v}
+
+    def _prepare_donation_vals(self, data):
+        vals = {
+            'donor_name': data.get('donor_name', ''),
+            'email': data.get('email', ''),
+            'phone': data.get('phone', ''),
+            'donation_type': data.get('donation_type', ''),
+            'amount_range': data.get('amount_range', ''),
+            'recognition': data.get('recognition', ''),
+            'interest_areas': data.get('interest_areas', ''),
+            'source': 'website'
+        }
+        # Remove empty values
+        return {k: v for k, v in vals.items() if v}
+
+    def _prepare_collaboration_vals(self, data):
+        vals = {
+            'institution_name': data.get('institution_name', ''),
+            'contact_name': data.get('contact_name', ''),
+            'email': data.get('email', ''),
+            'phone': data.get('phone', ''),
+            'collaboration_type': data.get('collaboration_type', ''),
+            'institution_type': data.get('institution_type', ''),
+            'country': data.get('country', ''),
+            'scope': data.get('scope', ''),
+            'source': 'website'
+        }
+        # Remove empty values
+        return {k: v for k, v in vals.items() if v}
+
+    def _is_async_intake(self):
+        return bool(request.env['ir.config_parameter'].sudo().get_param('forms_dashboard.async_intake'))
+
+    def _submit_inquiry(self, model, form_type, vals):
+        """ Create the inquiry, or only queue it when asynchronous intake is on """
         try:
-            vals = {
-                'company_name': kwargs.get('company_name', ''),
-                'contact_person': kwargs.get('contact_person', ''),
-                'email': kwargs.get('email', ''),
-                'phone': kwargs.get('phone', ''),
-                'partnership_type': kwargs.get('partnership_type', ''),
-                'company_size': kwargs.get('company_size', ''),
-                'industry': kwargs.get('industry', ''),
-                'goals': kwargs.get('partnership_goals', ''),
-                'source': 'website'
-            }
-            
-            # Remove empty values
-            vals = {k: v for k, v in vals.items() if v}
-            
-            # Create the record
-            inquiry = request.env['partnership.inquiry'].sudo().create(vals)
-            _logger.info("Partnership inquiry created with ID: %s", inquiry.id)
-            
-            # Return success response
-            return request.render('forms_dashboard.form_success', {
-                'form_type': 'Partnership',
-                'inquiry_id': inquiry.name,
-                'inquiry_details': vals
-            })
-            
+            # The duplicate fingerprint is claimed in this savepoint, so that a
+            # failed creation releases it and the visitor can send the form again
+            with request.env.cr.savepoint():
+                # Throttled and duplicate submissions are answered without touching the inquiry tables
+                verdict, retry_after = request.env['forms.intake.throttle'].sudo()._check_submission(
+                    model, vals, request.httprequest.remote_addr)
+                inquiry_name = False
+                if verdict == 'accepted' and self._is_async_intake():
+                    job = request.env['forms.intake.queue'].sudo()._enqueue(model, vals)
+                    _logger.info("%s inquiry queued as intake payload %s", form_type, job.id)
+                elif verdict == 'accepted':
+                    inquiry = request.env[model].sudo()._create_from_intake([vals])
+                    _logger.info("%s inquiry created with ID: %s", form_type, inquiry.id)
+                    inquiry_name = inquiry.name
+
         except Exception as e:
-            _logger.error("Error creating partnership inquiry: %s", str(e))
+            _logger.error("Error creating %s inquiry: %s", form_type.lower(), str(e))
             return request.render('forms_dashboard.form_error', {
                 'error_message': str(e),
-                'form_type': 'Partnership'
+                'form_type': form_type
             })
 
+        if verdict == 'rate_limited':
+            return request.make_response(
+                'Too many submissions, please try again later.',
+                headers=[('Content-Type', 'text/plain; charset=utf-8'), ('Retry-After', str(retry_after))],
+                status=429,
+            )
+        return request.render('forms_dashboard.form_success', {
+            'form_type': form_type,
+            'inquiry_id': inquiry_name,
+            'inquiry_details': vals
+        })
+
+    @http.route('/website_form/partnership.inquiry', type='http', auth="public", methods=['POST'], website=True, csrf=False)
+    @instrumented('/website_form/partnership.inquiry')
+    def create_partnership_inquiry(self, **kwargs):
+        _logger.info("Partnership form submitted with data: %s", kwargs)
+        vals = self._prepare_partnership_vals(kwargs)
+        return self._submit_inquiry('partnership.inquiry', 'Partnership', vals)
+
     @http.route('/website_form/donation.inquiry', type='http', auth="public", methods=['POST'], website=True, csrf=False)
+    @instrumented('/website_form/donation.inquiry')
     def create_donation_inquiry(self, **kwargs):
         _logger.info("Donation form submitted with data: %s", kwargs)
-        
-        try:
-            vals = {
-                'donor_name': kwargs.get('donor_name', ''),
-                'email': kwargs.get('email', ''),
-                'phone': kwargs.get('phone', ''),
-                'donation_type': kwargs.get('donation_type', ''),
-                'amount_range': kwargs.get('amount_range', ''),
-                'recognition': kwargs.get('recognition', ''),
-                'interest_areas': kwargs.get('interest_areas', ''),
-                'source': 'website'
-            }
-            
-            # Remove empty values
-            vals = {k: v for k, v in vals.items() if v}
-            
-            inquiry = request.env['donation.inquiry'].sudo().create(vals)
-            _logger.info("Donation inquiry created with ID: %s", inquiry.id)
-            
-            return request.render('forms_dashboard.form_success', {
-                'form_type': 'Donation',
-                'inquiry_id': inquiry.name,
-                'inquiry_details': vals
-            })
-            
-        except Exception as e:
-            _logger.error("Error creating donation inquiry: %s", str(e))
-            return request.render('forms_dashboard.form_error', {
-                'error_message': str(e),
-                'form_type': 'Donation'
-            })
+        vals = self._prepare_donation_vals(kwargs)
+        return self._submit_inquiry('donation.inquiry', 'Donation', vals)
 
     @http.route('/website_form/collaboration.inquiry', type='http', auth="public", methods=['POST'], website=True, csrf=False)
+    @instrumented('/website_form/collaboration.inquiry')
     def create_collaboration_inquiry(self, **kwargs):
         _logger.info("Collaboration form submitted with data: %s", kwargs)
-        
+        vals = self._prepare_collaboration_vals(kwargs)
+        return self._submit_inquiry('collaboration.inquiry', 'Collaboration', vals)
+
+    def _import_chunk(self, Inquiry, items):
+        """ Create one chunk of (index, vals) items, return {index: record or error} """
+        results = {}
         try:
-            vals = {
-                'institution_name': kwargs.get('institution_name', ''),
-                'contact_name': kwargs.get('contact_name', ''),
-                'email': kwargs.get('email', ''),
-                'phone': kwargs.get('phone', ''),
-                'collaboration_type': kwargs.get('collaboration_type', ''),
-                'institution_type': kwargs.get('institution_type', ''),
-                'country': kwargs.get('country', ''),
-                'scope': kwargs.get('scope', ''),
-                'source': 'website'
-            }
-            
-            # Remove empty values
-            vals = {k: v for k, v in vals.items() if v}
-            
-            inquiry = request.env['collaboration.inquiry'].sudo().create(vals)
-            _logger.info("Collaboration inquiry created with ID: %s", inquiry.id)
-            
-            return request.render('forms_dashboard.form_success', {
-                'form_type': 'Collaboration',
-                'inquiry_id': inquiry.name,
-                'inquiry_details': vals
-            })
-            
-        except Exception as e:
-            _logger.error("Error creating collaboration inquiry: %s", str(e))
-            return request.render('forms_dashboard.form_error', {
-                'error_message': str(e),
-                'form_type': 'Collaboration'
-            })
\ No newline at end of file
+            with request.env.cr.savepoint():
+                records = Inquiry._create_from_intake([vals for index, vals in items], summary=IMPORT_SUMMARY)
+            for (index, vals), record in zip(items, records):
+                results[index] = record
+        except Exception:
+            # Isolate the faulty payloads, the others still go through
+            for index, vals in items:
+                try:
+                    with request.env.cr.savepoint():
+                        results[index] = Inquiry._create_from_intake([vals], summary=IMPORT_SUMMARY)
+                except Exception as e:
+                    results[index] = str(e)
+        return results
+
+    @http.route('/forms_dashboard/api/inquiries', type='json', auth="bearer", methods=['POST'], csrf=False)
+    @instrumented('/forms_dashboard/api/inquiries')
+    def import_inquiries(self, partnership=None, donation=None, collaboration=None, **kwargs):
+        """ Batch intake for partner systems
+
+        Takes one list of form payloads per inquiry type, mapped like the
+        website forms, and returns one result per payload in the same order:
+        ``{'index', 'success', 'id', 'reference'}`` or ``{'index', 'success', 'error'}``.
+        """
+        batches = [
+            ('partnership', 'partnership.inquiry', self._prepare_partnership_vals, partnership or []),
+            ('donation', 'donation.inquiry', self._prepare_donation_vals, donation or []),
+            ('collaboration', 'collaboration.inquiry', self._prepare_collaboration_vals, collaboration or []),
+        ]
+        total = sum(len(payloads) for key, model, prepare, payloads in batches)
+        if total > API_MAX_ITEMS:
+            return {'error': f'Too many payloads: {total}, the limit is {API_MAX_ITEMS} per request'}
+
+        Queue = request.env['forms.intake.queue']
+        response = {}
+        for key, model, prepare, payloads in batches:
+            Inquiry = request.env[model]
+            Inquiry.check_access('create')
+            results = [None] * len(payloads)
+            valid = []
+            for index, payload in enumerate(payloads):
+                try:
+                    if not isinstance(payload, dict):
+                        raise ValueError('Payload must be an object')
+                    vals = dict(prepare(payload), source='import')
+                    Queue._validate_payload(model, vals)
+                    valid.append((index, vals))
+                except Exception as e:
+                    results[index] = {'index': index, 'success': False, 'error': str(e)}
+
+            for start in range(0, len(valid), API_CHUNK_SIZE):
+                created = self._import_chunk(Inquiry, valid[start:start + API_CHUNK_SIZE])
+                for index, outcome in created.items():
+                    if isinstance(outcome, str):
+                        results[index] = {'index': index, 'success': False, 'error': outcome}
+                    else:
+                        results[index] = {'index': index, 'success': True, 'id': outcome.id, 'reference': outcome.name}
+                # Keep memory flat on large batches
+                request.env.invalidate_all()
+
+            response[key] = results
+
+        _logger.info("Batch import by user %s: %s payloads, %s created", request.env.uid, total,
+                     sum(result['success'] for results in response.values() for result in results))
+        return response
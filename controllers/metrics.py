@@ -0,0 +1,20 @@
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import request
+
+
+class FormsDashboardMetrics(http.Controller):
+
+    @http.route('/forms_dashboard/metrics', type='http', auth="bearer", methods=['GET'])
+    def metrics(self, **kwargs):
+        """ Prometheus scrape target, with an API key of a Forms Dashboard manager
+
+        Figures are added up over all worker processes; each worker adds
+        its latest calls every few seconds, so a scrape may miss those.
+        """
+        if not request.env.user.has_group('forms_dashboard.group_forms_dashboard_manager'):
+            raise AccessError('Only Forms Dashboard managers can read the endpoint metrics.')
+        return request.make_response(
+            request.env['forms.endpoint.metric'].sudo()._get_metrics().to_prometheus(),
+            headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')],
+        )
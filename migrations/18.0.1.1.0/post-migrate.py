@@ -0,0 +1,13 @@
+import logging
+
+from odoo.addons.forms_dashboard.models.inquiry_indexes import INQUIRY_TABLES, create_inquiry_indexes
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    for table in INQUIRY_TABLES:
+        create_inquiry_indexes(cr, table)
+        # Refresh planner statistics so the new indexes are picked up right away
+        cr.execute(f'ANALYZE "{table}"')
+    _logger.info("Forms dashboard indexes created on %s", ", ".join(INQUIRY_TABLES))
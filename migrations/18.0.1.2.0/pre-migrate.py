@@ -0,0 +1,38 @@
+import logging
+
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# Former per-type many2one columns of inquiry_state_history: (column, model)
+LEGACY_COLUMNS = [
+    ('partnership_inquiry_id', 'partnership.inquiry'),
+    ('donation_inquiry_id', 'donation.inquiry'),
+    ('collaboration_inquiry_id', 'collaboration.inquiry'),
+]
+
+
+def migrate(cr, version):
+    """ Move the state history to (res_model, res_id) before the ORM makes them required """
+    if not column_exists(cr, 'inquiry_state_history', 'partnership_inquiry_id'):
+        return
+    cr.execute("""
+        ALTER TABLE inquiry_state_history
+            ADD COLUMN IF NOT EXISTS res_model varchar,
+            ADD COLUMN IF NOT EXISTS res_id int4
+    """)
+    for column, model in LEGACY_COLUMNS:
+        cr.execute(f"""
+            UPDATE inquiry_state_history
+               SET res_model = %s, res_id = "{column}"
+             WHERE "{column}" IS NOT NULL
+        """, [model])
+        _logger.info("Moved %s state history rows of %s", cr.rowcount, model)
+    # Rows not linked to any inquiry have nothing to point to
+    cr.execute("DELETE FROM inquiry_state_history WHERE res_id IS NULL")
+    cr.execute("""
+        ALTER TABLE inquiry_state_history
+            DROP COLUMN partnership_inquiry_id,
+            DROP COLUMN donation_inquiry_id,
+            DROP COLUMN collaboration_inquiry_id
+    """)
@@ -0,0 +1,14 @@
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+SLA_MODELS = ['partnership.inquiry', 'donation.inquiry', 'collaboration.inquiry']
+
+
+def migrate(cr, version):
+    # Backfill the new SLA columns from the existing state history
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    for model in SLA_MODELS:
+        env[model].recompute_sla_metrics()
@@ -1,5 +1,15 @@
+from . import inquiry_sla
+from . import inquiry_mixin
 from . import partnership_inquiry
 from . import donation_inquiry
 from . import collaboration_inquiry
 from . import collaboration_contact
 from . import inquiry_state_history
+from . import inquiry_tombstone
+from . import inquiry_daily_stat
+from . import inquiry_report
+from . import forms_intake_queue
+from . import forms_intake_throttle
+from . import forms_endpoint_metric
+from . import mail_activity
+from . import dashboard
\ No newline at end of file
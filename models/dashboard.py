@@ -1,74 +1,727 @@
 from odoo import models, fields, api
-from datetime import datetime, timedelta
+from odoo.exceptions import AccessError, UserError
+from odoo.tools import SQL
+from datetime import date, datetime, time, timedelta
+import logging
+import pytz
 
-class FormsDashboard(models.Model):
+from .dashboard_cache import dashboard_cache
+from .endpoint_metrics import METRICS_PARAM, instrumented
+from .inquiry_tombstone import TOMBSTONE_RETENTION
+
+_logger = logging.getLogger(__name__)
+
+# Inquiry models shown on the dashboard: (model, counter key, display type)
+DASHBOARD_MODELS = [
+    ('partnership.inquiry', 'partnerships', 'Partnership'),
+    ('donation.inquiry', 'donations', 'Donation'),
+    ('collaboration.inquiry', 'collaborations', 'Collaboration'),
+]
+
+# Number of buckets drawn by the trend chart for each period
+TREND_BUCKETS = {
+    'daily': 7,
+    'weekly': 4,
+    'monthly': 6,
+}
+
+# date_trunc unit of each trend period (PostgreSQL weeks are ISO weeks)
+TREND_UNITS = {
+    'daily': 'day',
+    'weekly': 'week',
+    'monthly': 'month',
+}
+
+MAX_TREND_BUCKETS = 366
+
+# Largest page the unified activity feed returns
+MAX_FEED_LIMIT = 500
+
+# Inquiry events pushed in one bus notification; past this, clients just reload
+MAX_PUSH_EVENTS = 100
+
+# Delta sync re-reads changes this far behind the watermark, to catch
+# transactions that started before it but committed after
+SYNC_OVERLAP = timedelta(minutes=1)
+
+# PostgreSQL sequence used as the cross-worker cache generation counter
+CACHE_SEQUENCE = 'forms_dashboard_cache_generation'
+
+class FormsDashboard(models.AbstractModel):
     _name = 'forms.dashboard'
     _description = 'Forms Dashboard'
 
+    def init(self):
+        self.env.cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(CACHE_SEQUENCE)))
+
     @api.model
-    def get_recent_activity(self):
-        """ Get recent activity across all inquiry types """
-        seven_days_ago = fields.Datetime.now() - timedelta(days=7)
-        
-        # Get recent partnerships
-        partnerships = self.env['partnership.inquiry'].search_read(
-            domain=[('create_date', '>=', seven_days_ago)],
-            fields=['name', 'state', 'create_date'],
-            limit=10,
-            order='create_date desc'
+    def _get_cache_generation(self):
+        """ Current cache generation, shared by all worker processes """
+        self.env.cr.execute(SQL(
+            "SELECT last_value + is_called::int FROM %s", SQL.identifier(CACHE_SEQUENCE)
+        ))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _invalidate_cache(self):
+        """ Bump the cache generation once the current transaction commits
+
+        Bumping after commit keeps transactions that start after the bump
+        from caching the old data under the new generation. It does not
+        cover a reader whose REPEATABLE READ snapshot predates the commit:
+        the sequence is read outside of snapshots, so such a reader may see
+        the new generation and cache older figures under it. Those entries
+        last until the TTL expires or the next write bumps the generation.
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('forms_dashboard.invalidate_cache'):
+            return
+        postcommit.data['forms_dashboard.invalidate_cache'] = True
+        registry = self.env.registry
+
+        @postcommit.add
+        def bump_cache_generation():
+            with registry.cursor() as cr:
+                cr.execute(SQL("SELECT nextval(%s)", CACHE_SEQUENCE))
+
+    @api.model
+    def _notify_inquiries(self, op, records, old_state=None):
+        """ Push inquiry changes to the open dashboards
+
+        Events are collected over the transaction and sent as a single bus
+        notification to the dashboard users group right before commit; a
+        large batch is sent as a plain reload request instead. Events of
+        changes rolled back by a savepoint are dropped then, see
+        _get_committed_events().
+        """
+        if not records:
+            return
+        precommit = self.env.cr.precommit
+        events = precommit.data.get('forms_dashboard.events')
+        if events is None:
+            events = precommit.data['forms_dashboard.events'] = []
+            env = self.env
+
+            @precommit.add
+            def push_dashboard_events():
+                group = env.ref('forms_dashboard.group_forms_dashboard_user', raise_if_not_found=False)
+                if not group:
+                    return
+                committed = None
+                if len(events) <= MAX_PUSH_EVENTS:
+                    committed = env['forms.dashboard']._get_committed_events(events)
+                if committed == []:
+                    return
+                payload = {'events': committed} if committed is not None else {'reload': True}
+                env['bus.bus'].sudo()._sendone(group, 'forms_dashboard/update', payload)
+
+        if len(events) > MAX_PUSH_EVENTS:
+            return
+        rank = next(index for index, (model, key, label) in enumerate(DASHBOARD_MODELS) if model == records._name)
+        model, key, label = DASHBOARD_MODELS[rank]
+        for record in records:
+            events.append({
+                'op': op,
+                'key': key,
+                'old_state': old_state,
+                'id': f"{key}_{record.id}",
+                'recordId': record.id,
+                'name': record.name or '',
+                'type': label,
+                'model': model,
+                'state': record.state or 'new',
+                'create_date': fields.Datetime.to_string(record.create_date),
+            })
+
+    @api.model
+    def _get_committed_events(self, events):
+        """ The events that still hold once the transaction commits
+
+        A savepoint rolled back after an event was recorded (the per-payload
+        fallback of the batch API, the per-job fallback of the intake queue)
+        leaves events of changes that never happened. They are told apart
+        by what the tables contain right before commit:
+
+        - a record created and gone again, loses all its events;
+        - a record still there, loses its unlink events;
+        - a record whose events no longer end in its actual state has had
+          a state change rolled back; then None is returned, and the
+          dashboards reload instead.
+        """
+        self.env.flush_all()
+        actual = {}
+        for model, key, label in DASHBOARD_MODELS:
+            ids = {event['recordId'] for event in events if event['model'] == model}
+            if ids:
+                rows = self.env.execute_query(SQL(
+                    "SELECT id, state FROM %s WHERE id IN %s",
+                    SQL.identifier(self.env[model]._table), tuple(ids),
+                ))
+                actual.update({(model, res_id): state or 'new' for res_id, state in rows})
+
+        by_record = {}
+        for event in events:
+            by_record.setdefault((event['model'], event['recordId']), []).append(event)
+        kept = set()
+        for record_key, record_events in by_record.items():
+            exists = record_key in actual
+            if not exists and any(event['op'] == 'create' for event in record_events):
+                continue
+            if exists:
+                record_events = [event for event in record_events if event['op'] != 'unlink']
+                if record_events and record_events[-1]['state'] != actual[record_key]:
+                    return None
+            kept.update(id(event) for event in record_events)
+        # Keep the order the changes were made in
+        return [event for event in events if id(event) in kept]
+
+    @api.model
+    def _get_cache_key(self, method, filters):
+        """ Cache key: normalized filters plus what record rules depend on """
+        access = (
+            self.env.su,
+            tuple(sorted(self.env.user.groups_id.ids)),
+            tuple(sorted(self.env.companies.ids)),
         )
+        if any(self._is_rule_restricted(model) for model, key, label in DASHBOARD_MODELS):
+            # Rules may depend on the user itself
+            access += (self.env.uid,)
+        return (self.env.cr.dbname, method, filters, access)
+
+    @api.model
+    def _is_rule_restricted(self, model):
+        """ Whether record rules limit the inquiries of ``model`` the user reads """
+        return not self.env.su and bool(self.env['ir.rule']._compute_domain(model, 'read'))
+
+    @api.model
+    def _cached(self, method, filters, compute):
+        """ Return compute() through the dashboard aggregate cache """
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        ttl = int(get_param('forms_dashboard.cache_ttl', 300))
+        if ttl <= 0:
+            return compute()
+        key = self._get_cache_key(method, filters)
+        generation = self._get_cache_generation()
+        value = dashboard_cache.get(key, generation, ttl)
+        if value is None:
+            value = compute()
+            dashboard_cache.put(key, generation, value, int(get_param('forms_dashboard.cache_size', 256)))
+        return value
+
+    @api.model
+    def get_cache_stats(self):
+        """ Hit/miss counters of this worker's dashboard cache """
+        return dict(dashboard_cache.stats(), generation=self._get_cache_generation())
+
+    @api.model
+    def get_endpoint_metrics(self):
+        """ Latency and SQL figures of the instrumented endpoints, over all workers """
+        enabled = self.env['ir.config_parameter'].sudo().get_param(METRICS_PARAM)
+        return {'enabled': bool(enabled), 'endpoints': self.env['forms.endpoint.metric'].sudo()._get_metrics().stats()}
+
+    @api.model
+    def reset_endpoint_metrics(self):
+        if not self.env.user.has_group('forms_dashboard.group_forms_dashboard_manager'):
+            raise AccessError('Only Forms Dashboard managers can reset the endpoint metrics.')
+        self.env['forms.endpoint.metric'].sudo()._reset()
+        return True
+
+    @api.model
+    def _get_date_bounds(self, date_range='7', date_from=None, date_to=None):
+        """ First and last day (UTC) covered by the date filter, None if open """
+        if date_range == 'custom':
+            if date_from and date_to:
+                return fields.Date.to_date(date_from), fields.Date.to_date(date_to)
+            return None, None
+        if date_range in (None, 'all'):
+            return None, None
+        return fields.Date.today() - timedelta(days=int(date_range)), None
+
+    @api.model
+    def _get_date_domain(self, date_range='7', date_from=None, date_to=None):
+        """ Build the create_date domain used by every dashboard widget """
+        first_day, last_day = self._get_date_bounds(date_range, date_from, date_to)
+        domain = []
+        if first_day:
+            domain.append(('create_date', '>=', datetime.combine(first_day, time.min)))
+        if last_day:
+            domain.append(('create_date', '<=', datetime.combine(last_day, time.max)))
+        return domain
+
+    @api.model
+    def _get_filter_domain(self, date_range='7', date_from=None, date_to=None, status='all'):
+        """ Date domain plus the status filter, as applied to listed inquiries """
+        domain = self._get_date_domain(date_range, date_from, date_to)
+        if status and status != 'all':
+            domain.append(('state', '=', status))
+        return domain
+
+    @api.model
+    def _get_day_domain(self, date_range='7', date_from=None, date_to=None):
+        """ Same filter as _get_date_domain, on inquiry.daily.stat days """
+        first_day, last_day = self._get_date_bounds(date_range, date_from, date_to)
+        domain = []
+        if first_day:
+            domain.append(('day', '>=', first_day))
+        if last_day:
+            domain.append(('day', '<=', last_day))
+        return domain
+
+    @api.model
+    def _get_trend_tz(self, tz=None):
+        """ Timezone used to cut trend buckets, defaulting to the user's """
+        tz = tz or self.env.context.get('tz') or self.env.user.tz
+        return tz if tz in pytz.all_timezones_set else 'UTC'
+
+    @api.model
+    def _get_trend_buckets(self, trend_period, count, tz):
+        """ Local start date of each trend bucket, oldest first """
+        today = datetime.now(pytz.timezone(tz)).date()
+        if trend_period == 'weekly':
+            monday = today - timedelta(days=today.weekday())
+            return [monday - timedelta(weeks=i) for i in range(count - 1, -1, -1)]
+        if trend_period == 'monthly':
+            months = today.year * 12 + today.month - 1
+            return [
+                date(year=(months - i) // 12, month=(months - i) % 12 + 1, day=1)
+                for i in range(count - 1, -1, -1)
+            ]
+        return [today - timedelta(days=i) for i in range(count - 1, -1, -1)]
+
+    @api.model
+    def _get_trend_query(self, model, domain, trend_period, tz, window_start):
+        """ SQL counting one inquiry model per trend bucket """
+        Inquiry = self.env[model]
+        query = Inquiry._search(domain + [('create_date', '>=', window_start)])
+        bucket = SQL(
+            "date_trunc(%s, timezone(%s, timezone('UTC', %s)))::date",
+            TREND_UNITS[trend_period], tz,
+            Inquiry._field_to_sql(Inquiry._table, 'create_date', query),
+        )
+        return SQL(
+            "SELECT %s, COUNT(*) FROM %s WHERE %s GROUP BY 1",
+            bucket, query.from_clause, query.where_clause,
+        )
+
+    @api.model
+    def _get_trend_series(self, domain, trend_period='daily', buckets=None, tz=None):
+        """ Count inquiries per time bucket, grouped in the database
+
+        Buckets are truncated in the requested timezone (ISO weeks for the
+        weekly view) and only the per-bucket counts leave the database.
+        """
+        if trend_period not in TREND_UNITS:
+            raise UserError(f'Unknown trend period: {trend_period}')
+        count = int(buckets or TREND_BUCKETS[trend_period])
+        if not 0 < count <= MAX_TREND_BUCKETS:
+            raise UserError(f'Trend bucket count must be between 1 and {MAX_TREND_BUCKETS}.')
+
+        tz = self._get_trend_tz(tz)
+        starts = self._get_trend_buckets(trend_period, count, tz)
+        # First bucket start as a UTC bound, so create_date stays indexable
+        window_start = pytz.timezone(tz).localize(datetime.combine(starts[0], time.min))
+        window_start = window_start.astimezone(pytz.utc).replace(tzinfo=None)
+        positions = {start: index for index, start in enumerate(starts)}
 
-        # Get recent donations
-        donations = self.env['donation.inquiry'].search_read(
-            domain=[('create_date', '>=', seven_days_ago)],
-            fields=['name', 'state', 'create_date'],
-            limit=10,
-            order='create_date desc'
+        series = {}
+        for model, key, label in DASHBOARD_MODELS:
+            rows = self.env.execute_query(
+                self._get_trend_query(model, domain, trend_period, tz, window_start))
+            data = [0] * count
+            for start, bucket_count in rows:
+                if start in positions:
+                    data[positions[start]] = bucket_count
+            series[key] = data
+
+        return {
+            'period': trend_period,
+            'tz': tz,
+            'buckets': [fields.Date.to_string(start) for start in starts],
+            'series': series,
+        }
+
+    @api.model
+    @instrumented('forms.dashboard.get_trend_series')
+    def get_trend_series(self, trend_period='daily', buckets=None, date_range='all',
+                         date_from=None, date_to=None, tz=None):
+        """ Trend chart counts per inquiry type, e.g. 90 days or 24 months """
+        domain = self._get_date_domain(date_range, date_from, date_to)
+        filters = (
+            self._get_date_bounds(date_range, date_from, date_to),
+            trend_period, buckets, self._get_trend_tz(tz), fields.Date.today(),
         )
+        return self._cached('get_trend_series', filters, lambda: self._get_trend_series(
+            domain, trend_period, buckets, tz))
+
+    @api.model
+    def _encode_feed_cursor(self, create_date, rank, res_id):
+        return f"{create_date.isoformat()}|{rank}|{res_id}"
+
+    @api.model
+    def _decode_feed_cursor(self, cursor):
+        try:
+            create_date, rank, res_id = cursor.split('|')
+            return datetime.fromisoformat(create_date), int(rank), int(res_id)
+        except (AttributeError, ValueError):
+            raise UserError(f'Invalid activity feed cursor: {cursor}')
+
+    @api.model
+    def _get_feed_query(self, domain, after, limit, descending=True, offset=0):
+        """ SQL of one activity feed page, starting after the given sort key """
+        direction = SQL("DESC") if descending else SQL("ASC")
+        branches = []
+        for rank, (model, key, label) in enumerate(DASHBOARD_MODELS):
+            Inquiry = self.env[model]
+            Inquiry.check_access('read')
+            query = Inquiry._search(domain, limit=offset + limit,
+                                    order='create_date desc, id desc' if descending else 'create_date, id')
+            create_date = Inquiry._field_to_sql(Inquiry._table, 'create_date', query)
+            res_id = Inquiry._field_to_sql(Inquiry._table, 'id', query)
+            if after:
+                # Only rows of this branch that sort after the cursor; at equal
+                # dates, higher ranks come first when descending, last otherwise
+                after_date, after_rank, after_id = after
+                if descending:
+                    if rank < after_rank:
+                        query.add_where(SQL("%s <= %s", create_date, after_date))
+                    elif rank == after_rank:
+                        query.add_where(SQL("(%s, %s) < (%s, %s)", create_date, res_id, after_date, after_id))
+                    else:
+                        query.add_where(SQL("%s < %s", create_date, after_date))
+                else:
+                    if rank > after_rank:
+                        query.add_where(SQL("%s >= %s", create_date, after_date))
+                    elif rank == after_rank:
+                        query.add_where(SQL("(%s, %s) > (%s, %s)", create_date, res_id, after_date, after_id))
+                    else:
+                        query.add_where(SQL("%s > %s", create_date, after_date))
+            branches.append(SQL("(%s)", query.select(
+                SQL("%s AS rank", rank),
+                SQL("%s AS id", res_id),
+                SQL("%s AS name", Inquiry._field_to_sql(Inquiry._table, 'name', query)),
+                SQL("%s AS state", Inquiry._field_to_sql(Inquiry._table, 'state', query)),
+                SQL("%s AS create_date", create_date),
+            )))
 
-        # Get recent collaborations
-        collaborations = self.env['collaboration.inquiry'].search_read(
-            domain=[('create_date', '>=', seven_days_ago)],
-            fields=['name', 'state', 'create_date'],
-            limit=10,
-            order='create_date desc'
+        return SQL(
+            "SELECT rank, id, name, state, create_date FROM (%s) AS feed "
+            "ORDER BY create_date %s, rank %s, id %s LIMIT %s OFFSET %s",
+            SQL(" UNION ALL ").join(branches), direction, direction, direction, limit, offset,
         )
 
-        # Combine and sort all activities
-        all_activities = []
-        for p in partnerships:
-            all_activities.append({
-                'id': f"p_{p['id']}",
-                'name': p['name'],
-                'type': 'Partnership',
-                'state': p['state'],
-                'date': fields.Datetime.to_string(p['create_date']),
-            })
-        
-        for d in donations:
-            all_activities.append({
-                'id': f"d_{d['id']}",
-                'name': d['name'],
-                'type': 'Donation',
-                'state': d['state'],
-                'date': fields.Datetime.to_string(d['create_date']),
-            })
-            
-        for c in collaborations:
-            all_activities.append({
-                'id': f"c_{c['id']}",
-                'name': c['name'],
-                'type': 'Collaboration',
-                'state': c['state'],
-                'date': fields.Datetime.to_string(c['create_date']),
+    @api.model
+    def _get_activity_feed(self, domain, cursor=None, limit=50, descending=True, offset=0):
+        """ One page of the unified activity feed, newest first
+
+        The three inquiry tables are merged by a single UNION ALL ordered on
+        (create_date, type, id). Paging is keyset based: the cursor holds the
+        sort key of the last row returned, so every page costs the same no
+        matter how deep the user scrolls. ``offset`` is only meant for jumps
+        to a page whose predecessor was never loaded.
+        """
+        limit = min(max(int(limit), 1), MAX_FEED_LIMIT)
+        after = self._decode_feed_cursor(cursor) if cursor else None
+        offset = 0 if after else max(int(offset or 0), 0)
+        rows = self.env.execute_query(self._get_feed_query(domain, after, limit + 1, descending, offset))
+
+        items = []
+        for rank, res_id, name, state, create_date in rows[:limit]:
+            model, key, label = DASHBOARD_MODELS[rank]
+            items.append({
+                'id': f"{key}_{res_id}",
+                'recordId': res_id,
+                'name': name or '',
+                'type': label,
+                'model': model,
+                'state': state or 'new',
+                'create_date': fields.Datetime.to_string(create_date),
             })
 
-        return sorted(all_activities, key=lambda x: x['date'], reverse=True)[:10]
+        next_cursor = False
+        if len(rows) > limit:
+            rank, res_id, name, state, create_date = rows[limit - 1]
+            next_cursor = self._encode_feed_cursor(create_date, rank, res_id)
+        return {'items': items, 'next_cursor': next_cursor}
+
+    @api.model
+    @instrumented('forms.dashboard.get_activity_feed')
+    def get_activity_feed(self, date_range='7', date_from=None, date_to=None,
+                          status='all', cursor=None, limit=50, sort='newest', offset=0,
+                          with_total=False):
+        """ Page through the inquiries of all types matching the dashboard filters
+
+        ``sort`` is 'newest' or 'oldest'; ``with_total`` adds the number of
+        matching inquiries, which the virtual activity table sizes itself on.
+        """
+        domain = self._get_filter_domain(date_range, date_from, date_to, status)
+        page = self._get_activity_feed(domain, cursor, limit, descending=sort != 'oldest', offset=offset)
+        if with_total:
+            page['total'] = sum(self.env[model].search_count(domain) for model, key, label in DASHBOARD_MODELS)
+        return page
+
+    @api.model
+    @instrumented('forms.dashboard.get_dashboard_snapshot')
+    def get_dashboard_snapshot(self, date_range='7', date_from=None, date_to=None, trend_period='daily'):
+        """ Counters, status breakdown, trend and SLA figures in one call
+
+        The activity table pages the feed itself (get_activity_feed), so the
+        snapshot does not depend on the status filter.
+        """
+        filters = (
+            self._get_date_bounds(date_range, date_from, date_to),
+            trend_period, self._get_trend_tz(), fields.Date.today(),
+        )
+        return self._cached('get_dashboard_snapshot', filters, lambda: self._compute_dashboard_snapshot(
+            date_range, date_from, date_to, trend_period))
+
+    @api.model
+    def _get_watermark(self, generation):
+        """ What a client has seen: the cache generation and the sync time """
+        return {'generation': generation, 'write_date': fields.Datetime.to_string(self.env.cr.now())}
+
+    @api.model
+    @instrumented('forms.dashboard.get_dashboard_delta')
+    def get_dashboard_delta(self, watermark=None, date_range='7', date_from=None, date_to=None,
+                            status='all', trend_period='daily'):
+        """ Refresh the dashboard from a watermark returned by a previous call
+
+        Returns ``{'not_modified': True}`` when no inquiry changed since the
+        watermark. Otherwise returns the (cached) counters, status, trend and
+        SLA figures along with only the feed items changed (``changed``) or
+        deleted (``removed``) since the watermark; without a watermark, or
+        when too much changed, the full snapshot is returned with
+        ``'full': True``. Each answer carries the next watermark.
+
+        Items are not filtered on ``status``: they tell with ``matched`` and
+        ``matches`` whether they belonged to the status filter at the
+        watermark and now, from which the activity table moves them in or
+        out. ``created`` flags the inquiries created after the watermark.
+        """
+        generation = self._get_cache_generation()
+        if watermark and watermark.get('generation') == generation:
+            return {'not_modified': True, 'watermark': watermark}
+        new_watermark = self._get_watermark(generation)
+        snapshot = self.get_dashboard_snapshot(date_range, date_from, date_to, trend_period)
+        full = dict(snapshot, full=True, watermark=new_watermark)
+        if not watermark or not watermark.get('write_date'):
+            return full
+        seen = fields.Datetime.to_datetime(watermark['write_date'])
+        if seen < self.env.cr.now() - TOMBSTONE_RETENTION:
+            # Deletions that old are forgotten
+            return full
+
+        since = seen - SYNC_OVERLAP
+        domain = self._get_date_domain(date_range, date_from, date_to)
+
+        def matches(state):
+            return not status or status == 'all' or state == status
+
+        def feed_item(model, key, label, res_id, name, state, create_date, old_state):
+            return {
+                'id': f"{key}_{res_id}",
+                'recordId': res_id,
+                'name': name or '',
+                'type': label,
+                'model': model,
+                'state': state or 'new',
+                'create_date': fields.Datetime.to_string(create_date),
+                'created': create_date >= seen,
+                'matched': create_date < seen and matches(old_state or 'new'),
+            }
+
+        changed = []
+        removed = []
+        tombstones = self.env['inquiry.tombstone'].sudo().search_fetch(
+            [('date', '>=', since)] + [('record_create_date', op, value) for field, op, value in domain],
+            ['res_model', 'res_id', 'name', 'state', 'record_create_date'],
+            limit=MAX_FEED_LIMIT + 1,
+        )
+        if len(tombstones) > MAX_FEED_LIMIT:
+            return full
+        for model, key, label in DASHBOARD_MODELS:
+            deleted = tombstones.filtered(lambda tombstone: tombstone.res_model == model)
+            if deleted and self._is_rule_restricted(model):
+                # Record rules cannot tell whether a deleted row was visible
+                return full
+            records = self.env[model].search_fetch(
+                domain + [('write_date', '>=', since)], ['name', 'state', 'create_date'],
+                limit=MAX_FEED_LIMIT + 1, order='write_date desc',
+            )
+            if len(records) > MAX_FEED_LIMIT:
+                return full
+            old_states = self._get_states_at(model, records.ids, seen)
+            changed += [
+                dict(feed_item(model, key, label, record.id, record.name, record.state,
+                               record.create_date, old_states.get(record.id, record.state)),
+                     matches=matches(record.state or 'new'))
+                for record in records
+            ]
+            # The state at deletion stands for the state at the watermark
+            removed += [
+                dict(feed_item(model, key, label, tombstone.res_id, tombstone.name, tombstone.state,
+                               tombstone.record_create_date, tombstone.state),
+                     matches=False)
+                for tombstone in deleted
+            ]
+        changed.sort(key=lambda item: item['create_date'], reverse=True)
+        removed.sort(key=lambda item: item['create_date'], reverse=True)
+        return {
+            'counts': snapshot['counts'],
+            'status': snapshot['status'],
+            'trend': snapshot['trend'],
+            'sla': snapshot['sla'],
+            'changed': changed,
+            'removed': removed,
+            'watermark': new_watermark,
+        }
+
+    @api.model
+    def _get_states_at(self, model, res_ids, moment):
+        """ {id: state} at ``moment`` of the given inquiries that changed
+        state since, read back from their state history """
+        if not res_ids:
+            return {}
+        History = self.env['inquiry.state.history']
+        History.flush_model(['res_model', 'res_id', 'date', 'old_state'])
+        rows = self.env.execute_query(SQL(
+            "SELECT DISTINCT ON (res_id) res_id, old_state FROM %s "
+            "WHERE res_model = %s AND res_id IN %s AND date >= %s "
+            "ORDER BY res_id, date, id",
+            SQL.identifier(History._table), model, tuple(res_ids), moment,
+        ))
+        return dict(rows)
+
+    @api.model
+    def _compute_dashboard_snapshot(self, date_range='7', date_from=None, date_to=None, trend_period='daily'):
+        """ Uncached body of get_dashboard_snapshot
+
+        Counters and the status breakdown are read from the daily rollup
+        (inquiry.daily.stat), so long ranges sum a few hundred rows instead
+        of scanning the inquiry tables. The rollup ignores record rules, so
+        users restricted by one are counted from the inquiry tables instead.
+        """
+        domain = self._get_date_domain(date_range, date_from, date_to)
+        day_domain = self._get_day_domain(date_range, date_from, date_to)
+        new_domain = [('create_date', '>=', fields.Datetime.now() - timedelta(days=1))]
+
+        counts = {}
+        status_counts = {}
+        for model, key, label in DASHBOARD_MODELS:
+            Inquiry = self.env[model]
+            Inquiry.check_access('read')
+            total = 0
+            if self._is_rule_restricted(model):
+                # The rollup holds global counts, count what the user may read
+                state_counts = dict(Inquiry._read_group(domain, groupby=['state'], aggregates=['__count']))
+            else:
+                state_counts = self.env['inquiry.daily.stat']._get_counts(model, day_domain)
+            for state, state_count in state_counts.items():
+                status_counts[state] = status_counts.get(state, 0) + state_count
+                total += state_count
+            counts[key] = total
+            counts[f'{key}_new'] = Inquiry.search_count(new_domain)
+
+        return {
+            'counts': counts,
+            'status': status_counts,
+            'trend': self._get_trend_series(domain, trend_period),
+            'sla': self._get_sla_metrics(domain),
+        }
+
+    @api.model
+    def _get_sla_metrics(self, domain):
+        """ SLA panel figures, aggregated from the stored per-inquiry metrics """
+        types = {}
+        for model, key, label in DASHBOARD_MODELS:
+            groups = self.env[model]._read_group(
+                domain,
+                groupby=['sla_breached'],
+                aggregates=['__count', 'first_response_date:count', 'first_response_hours:sum',
+                            'milestone_date:count', 'milestone_hours:sum'],
+            )
+            total = responded = reached = breached = 0
+            response_hours = milestone_hours = 0.0
+            for is_breached, count, responded_count, response_sum, reached_count, milestone_sum in groups:
+                total += count
+                responded += responded_count
+                response_hours += response_sum or 0.0
+                reached += reached_count
+                milestone_hours += milestone_sum or 0.0
+                if is_breached:
+                    breached += count
+            types[key] = {
+                'label': label,
+                'total': total,
+                'responded': responded,
+                'avg_first_response_hours': round(response_hours / responded, 1) if responded else None,
+                'reached_milestone': reached,
+                'avg_milestone_hours': round(milestone_hours / reached, 1) if reached else None,
+                'breached': breached,
+                'breach_rate': round(breached / total, 4) if total else 0.0,
+            }
+        return {
+            'threshold_hours': self.env['inquiry.sla.mixin']._get_sla_hours(),
+            'types': types,
+        }
+
+    @api.model
+    def _cron_flag_sla_breaches(self):
+        for model, key, label in DASHBOARD_MODELS:
+            self.env[model]._cron_flag_sla_breaches()
+
+    @api.model
+    def check_query_plans(self, date_range='30', status='new', trend_period='daily'):
+        """ EXPLAIN the dashboard's hot queries and flag sequential scans
+
+        Meant to be run after an upgrade, e.g. from ``odoo shell``:
+        ``print(env['forms.dashboard'].check_query_plans())``
+        """
+        domain = self._get_date_domain(date_range)
+        tz = self._get_trend_tz()
+        starts = self._get_trend_buckets(trend_period, TREND_BUCKETS[trend_period], tz)
+        window_start = datetime.combine(starts[0], time.min)
+
+        queries = [('activity feed', self._get_feed_query(domain, None, 51))]
+        if status and status != 'all':
+            queries.append(('activity feed by status',
+                            self._get_feed_query(domain + [('state', '=', status)], None, 51)))
+        for model, key, label in DASHBOARD_MODELS:
+            Inquiry = self.env[model]
+            new_query = Inquiry._search([('create_date', '>=', fields.Datetime.now() - timedelta(days=1))])
+            queries.append((f'{label} trend', self._get_trend_query(
+                model, domain, trend_period, tz, window_start)))
+            queries.append((f'{label} new in 24h', new_query.select(SQL("COUNT(*)"))))
+
+        report = []
+        for name, query in queries:
+            self.env.cr.execute(SQL("EXPLAIN %s", query))
+            plan = [line for line, in self.env.cr.fetchall()]
+            seq_scans = [line.strip() for line in plan if 'Seq Scan' in line]
+            report.append(f"== {name}: {'SEQUENTIAL SCAN' if seq_scans else 'ok'}")
+            report.extend(plan)
+        report = "\n".join(report)
+        _logger.info("Forms dashboard query plans:\n%s", report)
+        return report
+
+    @api.model
+    @instrumented('forms.dashboard.get_recent_activity')
+    def get_recent_activity(self):
+        """ Get recent activity across all inquiry types """
+        seven_days_ago = fields.Datetime.now() - timedelta(days=7)
+        feed = self._get_activity_feed([('create_date', '>=', seven_days_ago)], limit=10)
+        return [{
+            'id': f"{activity['type'][0].lower()}_{activity['recordId']}",
+            'name': activity['name'],
+            'type': activity['type'],
+            'state': activity['state'],
+            'date': activity['create_date'],
+        } for activity in feed['items']]
 
 class PartnershipInquiry(models.Model):
     _inherit = 'partnership.inquiry'
 
     @api.model
+    @instrumented('partnership.inquiry.get_dashboard_data')
     def get_dashboard_data(self):
         return {
             'total': self.search_count([]),
@@ -79,6 +732,7 @@ class DonationInquiry(models.Model):
     _inherit = 'donation.inquiry'
 
     @api.model
+    @instrumented('donation.inquiry.get_dashboard_data')
     def get_dashboard_data(self):
         return {
             'total': self.search_count([]),
@@ -89,6 +743,7 @@ class CollaborationInquiry(models.Model):
     _inherit = 'collaboration.inquiry'
 
     @api.model
+    @instrumented('collaboration.inquiry.get_dashboard_data')
     def get_dashboard_data(self):
         return {
             'total': self.search_count([]),
@@ -0,0 +1,223 @@
+from odoo.http import request
+from odoo.models import BaseModel
+import functools
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Upper bounds of the SQL query count histogram buckets
+QUERY_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Config parameter switching the instrumentation on
+METRICS_PARAM = 'forms_dashboard.metrics_enabled'
+
+# Seconds a worker keeps its observations before adding them to the shared table
+FLUSH_INTERVAL = 10
+
+
+class Histogram:
+    """ Bucket counts (not cumulative), sum and count of the observations """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """ Upper bound of the bucket holding the q-quantile, None past the last bound """
+        if not self.count:
+            return None
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return None
+
+
+class EndpointMetrics:
+    """ Latency, SQL query and row counts of instrumented endpoints
+
+    The instance of each worker process only holds what the process
+    observed since its last flush to forms.endpoint.metric, the table all
+    workers add up into; the figures served are read back from there (see
+    to_rows() and add_rows()).
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def _get(self, endpoint):
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = {
+                'latency': Histogram(LATENCY_BUCKETS),
+                'queries': Histogram(QUERY_BUCKETS),
+                'rows': 0,
+                'errors': 0,
+            }
+        return metrics
+
+    def observe(self, endpoint, seconds, queries, rows, error):
+        with self._lock:
+            metrics = self._get(endpoint)
+            metrics['latency'].observe(seconds)
+            metrics['queries'].observe(queries)
+            metrics['rows'] += rows
+            metrics['errors'] += error
+
+    def stats(self):
+        """ One summary per endpoint, as shown by the dashboard debug panel """
+        with self._lock:
+            result = []
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                latency, queries = metrics['latency'], metrics['queries']
+                p50, p95 = latency.quantile(0.5), latency.quantile(0.95)
+                result.append({
+                    'endpoint': endpoint,
+                    'calls': latency.count,
+                    'errors': metrics['errors'],
+                    'avg_ms': round(latency.sum / latency.count * 1000, 2),
+                    'p50_ms': p50 and p50 * 1000,
+                    'p95_ms': p95 and p95 * 1000,
+                    'avg_queries': round(queries.sum / queries.count, 1),
+                    'rows': metrics['rows'],
+                })
+            return result
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_rows(self):
+        """ (endpoint, series, bucket, value) rows, bucket -1 holding sums and counters """
+        with self._lock:
+            rows = []
+            for endpoint, metrics in self._endpoints.items():
+                for series in ('latency', 'queries'):
+                    histogram = metrics[series]
+                    rows += [(endpoint, series, index, count) for index, count in enumerate(histogram.buckets) if count]
+                    rows.append((endpoint, series, -1, histogram.sum))
+                rows.append((endpoint, 'rows', -1, metrics['rows']))
+                rows.append((endpoint, 'errors', -1, metrics['errors']))
+            return rows
+
+    def add_rows(self, rows):
+        """ Add up rows produced by to_rows() """
+        with self._lock:
+            for endpoint, series, bucket, value in rows:
+                metrics = self._get(endpoint)
+                if series in ('latency', 'queries'):
+                    histogram = metrics[series]
+                    if bucket < 0:
+                        histogram.sum += value
+                    else:
+                        histogram.buckets[bucket] += int(value)
+                        histogram.count += int(value)
+                else:
+                    metrics[series] += int(value)
+
+    def take(self, interval=0):
+        """ Move out the observations once ``interval`` seconds passed since the last take """
+        with self._lock:
+            if not self._endpoints or time.monotonic() - self._flushed_at < interval:
+                return None
+            taken = EndpointMetrics()
+            taken._endpoints, self._endpoints = self._endpoints, {}
+            self._flushed_at = time.monotonic()
+            return taken
+
+    def to_prometheus(self):
+        """ The metrics in the Prometheus text exposition format """
+        lines = []
+
+        def histogram(name, help_text, key):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                labels = f'endpoint="{endpoint}"'
+                values = metrics[key]
+                cumulative = 0
+                for bound, count in zip(values.bounds + ('+Inf',), values.buckets):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {values.sum}')
+                lines.append(f'{name}_count{{{labels}}} {values.count}')
+
+        def counter(name, help_text, key):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {metrics[key]}')
+
+        with self._lock:
+            histogram('forms_dashboard_request_duration_seconds', 'Wall time of the call.', 'latency')
+            histogram('forms_dashboard_request_queries', 'SQL queries run by the call.', 'queries')
+            counter('forms_dashboard_request_rows_total', 'Rows or records returned.', 'rows')
+            counter('forms_dashboard_request_errors_total', 'Calls that raised.', 'errors')
+        return '\n'.join(lines) + '\n'
+
+
+# Observations of this process not flushed yet
+endpoint_metrics = EndpointMetrics()
+
+
+def _count_rows(result):
+    """ Size of what a call returned: records, list items or feed items """
+    if isinstance(result, (BaseModel, list, tuple)):
+        return len(result)
+    if isinstance(result, dict) and isinstance(result.get('items'), list):
+        return len(result['items'])
+    return 0
+
+
+def instrumented(endpoint):
+    """ Record the latency, query count and returned rows of every call
+
+    Works on model methods and on controller routes. When the
+    ``forms_dashboard.metrics_enabled`` config parameter is off, which is
+    the default, the cost is one cached parameter lookup. Observations are
+    added to the shared table at most every FLUSH_INTERVAL seconds, on a
+    transaction of their own.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            env = self.env if isinstance(self, BaseModel) else request.env
+            if not env['ir.config_parameter'].sudo().get_param(METRICS_PARAM):
+                return method(self, *args, **kwargs)
+            cr = env.cr
+            queries = cr.sql_log_count
+            start = time.perf_counter()
+            result, error = None, True
+            try:
+                result = method(self, *args, **kwargs)
+                error = False
+                return result
+            finally:
+                endpoint_metrics.observe(endpoint, time.perf_counter() - start,
+                                         cr.sql_log_count - queries, _count_rows(result), error)
+                taken = endpoint_metrics.take(FLUSH_INTERVAL)
+                if taken:
+                    try:
+                        env['forms.endpoint.metric'].sudo()._flush(taken)
+                    except Exception:
+                        _logger.exception("Could not flush the endpoint metrics")
+        return wrapper
+    return decorator
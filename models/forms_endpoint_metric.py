@@ -0,0 +1,62 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+from .endpoint_metrics import EndpointMetrics, endpoint_metrics
+
+class FormsEndpointMetric(models.Model):
+    """ Endpoint metrics added up over all worker processes
+
+    One row per endpoint, series and histogram bucket (-1 for sums and
+    counters), in an unlogged table: losing it on a crash only resets the
+    metrics. Workers add their observations with one upsert every few
+    seconds, see endpoint_metrics.instrumented().
+    """
+    _name = 'forms.endpoint.metric'
+    _description = 'Forms Dashboard Endpoint Metric'
+    _log_access = False
+
+    endpoint = fields.Char(string='Endpoint', required=True)
+    series = fields.Char(string='Series', required=True)
+    bucket = fields.Integer(string='Bucket', required=True)
+    value = fields.Float(string='Value')
+
+    _sql_constraints = [
+        ('endpoint_series_bucket_unique', 'UNIQUE(endpoint, series, bucket)',
+         'Endpoint metrics must be unique per endpoint, series and bucket.'),
+    ]
+
+    def init(self):
+        self.env.cr.execute(SQL("ALTER TABLE %s SET UNLOGGED", SQL.identifier(self._table)))
+
+    @api.model
+    def _flush(self, metrics):
+        """ Add the observations of an EndpointMetrics to the table, in a
+        transaction of its own """
+        # Sorted, so that concurrent flushes lock the rows in the same order
+        rows = sorted(metrics.to_rows())
+        if not rows:
+            return
+        with self.env.registry.cursor() as cr:
+            cr.execute(SQL(
+                "INSERT INTO %(table)s (endpoint, series, bucket, value) VALUES %(values)s "
+                "ON CONFLICT (endpoint, series, bucket) DO UPDATE SET value = t.value + EXCLUDED.value",
+                table=SQL("%s AS t", SQL.identifier(self._table)),
+                values=SQL(", ").join(SQL("(%s, %s, %s, %s)", *row) for row in rows),
+            ))
+
+    @api.model
+    def _get_metrics(self):
+        """ EndpointMetrics of every worker: the table plus what this
+        process has not flushed yet """
+        self.env.cr.execute(SQL(
+            "SELECT endpoint, series, bucket, value FROM %s", SQL.identifier(self._table),
+        ))
+        metrics = EndpointMetrics()
+        metrics.add_rows(self.env.cr.fetchall())
+        metrics.add_rows(endpoint_metrics.to_rows())
+        return metrics
+
+    @api.model
+    def _reset(self):
+        endpoint_metrics.clear()
+        self.env.cr.execute(SQL("DELETE FROM %s", SQL.identifier(self._table)))
@@ -0,0 +1,167 @@
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from datetime import timedelta
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Failed payloads are retried this many times before going to dead letter
+MAX_ATTEMPTS = 5
+
+# Payloads converted into inquiries per batch
+BATCH_SIZE = 200
+
+# Seconds a single cron run keeps draining the queue
+CRON_TIME_BUDGET = 50
+
+# Days processed payloads are kept before being garbage collected
+DONE_RETENTION_DAYS = 7
+
+class FormsIntakeQueue(models.Model):
+    _name = 'forms.intake.queue'
+    _description = 'Website Form Intake Queue'
+    _order = 'id'
+
+    res_model = fields.Selection([
+        ('partnership.inquiry', 'Partnership'),
+        ('donation.inquiry', 'Donation'),
+        ('collaboration.inquiry', 'Collaboration'),
+    ], string='Inquiry Type', required=True, readonly=True)
+    payload = fields.Json(string='Payload', readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('failed', 'Failed (will retry)'),
+        ('done', 'Done'),
+        ('dead', 'Dead Letter'),
+    ], string='Status', default='pending', required=True, readonly=True)
+    attempts = fields.Integer(string='Attempts', readonly=True)
+    next_attempt = fields.Datetime(string='Next Attempt', readonly=True)
+    error = fields.Text(string='Last Error', readonly=True)
+    res_id = fields.Many2oneReference(string='Inquiry ID', model_field='res_model', readonly=True)
+
+    def init(self):
+        # Only open payloads are ever scanned by the queue runner
+        self.env.cr.execute(SQL(
+            "CREATE INDEX IF NOT EXISTS %s ON %s (id) WHERE state IN ('pending', 'failed')",
+            SQL.identifier(f'{self._table}_open_index'), SQL.identifier(self._table),
+        ))
+
+    @api.model
+    def _validate_payload(self, res_model, vals):
+        """ Check a payload would pass create() before accepting it """
+        Inquiry = self.env[res_model]
+        for name, field in Inquiry._fields.items():
+            if field.required and field.default is None and not field.compute and not vals.get(name):
+                raise ValidationError(f'Missing required field: {field.string}')
+        for name, value in vals.items():
+            field = Inquiry._fields.get(name)
+            if field is None:
+                raise ValidationError(f'Unknown field: {name}')
+            if field.type == 'selection' and value not in field.get_values(self.env):
+                raise ValidationError(f'Invalid value for {field.string}: {value}')
+
+    @api.model
+    def _enqueue(self, res_model, vals):
+        """ Stage a validated website submission for asynchronous creation """
+        self._validate_payload(res_model, vals)
+        return self.create({'res_model': res_model, 'payload': vals})
+
+    def _mark_failed(self, error):
+        now = fields.Datetime.now()
+        for job in self:
+            attempts = job.attempts + 1
+            job.write({
+                'attempts': attempts,
+                'error': error,
+                'state': 'dead' if attempts >= MAX_ATTEMPTS else 'failed',
+                # Exponential backoff: 2, 4, 8, 16 minutes
+                'next_attempt': now + timedelta(minutes=2 ** attempts),
+            })
+            if job.state == 'dead':
+                _logger.warning("Intake payload %s moved to dead letter: %s", job.id, error)
+
+    def _process(self):
+        """ Create the inquiries of these payloads, one create() per model """
+        for res_model, jobs in self.grouped('res_model').items():
+            Inquiry = self.env[res_model].sudo()
+            try:
+                with self.env.cr.savepoint():
+                    records = Inquiry._create_from_intake([job.payload for job in jobs])
+                for job, record in zip(jobs, records):
+                    job.write({'state': 'done', 'res_id': record.id, 'error': False})
+            except Exception:
+                # Isolate the faulty payloads, the others still go through
+                for job in jobs:
+                    try:
+                        with self.env.cr.savepoint():
+                            record = Inquiry._create_from_intake([job.payload])
+                        job.write({'state': 'done', 'res_id': record.id, 'error': False})
+                    except Exception as e:
+                        job._mark_failed(str(e))
+
+    @api.model
+    def _fetch_batch(self, limit=BATCH_SIZE):
+        """ Lock the next open payloads, skipping those another worker holds """
+        # Payloads of the previous batch must not look open anymore
+        self.flush_model(['state', 'next_attempt'])
+        self.env.cr.execute(SQL(
+            "SELECT id FROM %s WHERE state IN ('pending', 'failed') "
+            "AND (next_attempt IS NULL OR next_attempt <= %s) "
+            "ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED",
+            SQL.identifier(self._table), fields.Datetime.now(), limit,
+        ))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def process_queue(self, batch_size=BATCH_SIZE, time_budget=CRON_TIME_BUDGET, auto_commit=False):
+        """ Drain the queue in batches until it is empty or time runs out """
+        auto_commit = auto_commit and not getattr(threading.current_thread(), 'testing', False)
+        deadline = time.monotonic() + time_budget
+        processed = 0
+        while time.monotonic() < deadline:
+            jobs = self._fetch_batch(batch_size)
+            if not jobs:
+                break
+            jobs._process()
+            processed += len(jobs)
+            if auto_commit:
+                self.env.cr.commit()
+        return processed
+
+    @api.model
+    def _cron_process_queue(self):
+        processed = self.process_queue(auto_commit=True)
+        if processed:
+            _logger.info("Intake queue processed %s payloads", processed)
+        self._gc_done()
+
+    @api.model
+    def _gc_done(self):
+        limit_date = fields.Datetime.now() - timedelta(days=DONE_RETENTION_DAYS)
+        self.search([('state', '=', 'done'), ('write_date', '<', limit_date)]).unlink()
+
+    def action_requeue(self):
+        """ Send dead-letter payloads back to the queue """
+        self.filtered(lambda job: job.state in ('dead', 'failed')).write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_attempt': False,
+        })
+
+    @api.model
+    def get_queue_metrics(self):
+        """ Queue depth per state, age of the oldest open payload, hourly throughput """
+        depth = {state: 0 for state, label in self._fields['state'].selection}
+        for state, count in self.sudo()._read_group([], ['state'], ['__count']):
+            depth[state] = count
+        oldest = self.sudo().search([('state', 'in', ('pending', 'failed'))], limit=1, order='id')
+        hour_ago = fields.Datetime.now() - timedelta(hours=1)
+        return {
+            'depth': depth,
+            'open': depth['pending'] + depth['failed'],
+            'oldest_open_age': (fields.Datetime.now() - oldest.create_date).total_seconds() if oldest else 0,
+            'done_last_hour': self.sudo().search_count([('state', '=', 'done'), ('write_date', '>=', hour_ago)]),
+        }
@@ -0,0 +1,190 @@
+from odoo import models, fields, api
+from odoo.tools import SQL, email_normalize
+import hashlib
+import json
+import logging
+import math
+
+_logger = logging.getLogger(__name__)
+
+# Config parameter: default value
+THROTTLE_PARAMS = {
+    'forms_dashboard.throttle_ip_burst': 5,
+    'forms_dashboard.throttle_ip_per_hour': 30,
+    'forms_dashboard.throttle_email_burst': 3,
+    'forms_dashboard.throttle_email_per_hour': 10,
+    'forms_dashboard.duplicate_window': 600,
+}
+
+# Hours a bucket or duplicate key is kept after its last use
+THROTTLE_RETENTION_HOURS = 24
+
+
+class FormsIntakeThrottle(models.Model):
+    """ Token buckets and recent payload fingerprints of the website forms
+
+    Lives in PostgreSQL so that every worker sees the same state, in an
+    unlogged table since losing it on a crash only resets the limits.
+    Token buckets are taken on their own short transaction: bucket rows
+    are locked only for the duration of one upsert, and rejected
+    submissions are counted even though nothing else gets committed for
+    them. The accepted/rejected counters of all workers are kept in the
+    same table, under ``stat:`` keys with the count in ``tokens``. Payload
+    fingerprints are claimed in the caller's transaction
+    instead, so that they are released if the submission fails to be
+    saved and an identical resubmission is not mistaken for a duplicate.
+    """
+    _name = 'forms.intake.throttle'
+    _description = 'Website Form Throttling State'
+    _log_access = False
+
+    key = fields.Char(string='Key', required=True)
+    tokens = fields.Float(string='Tokens')
+    updated_at = fields.Datetime(string='Last Used', required=True)
+
+    _sql_constraints = [
+        ('key_unique', 'UNIQUE(key)', 'Throttle keys must be unique.'),
+    ]
+
+    def init(self):
+        self.env.cr.execute(SQL("ALTER TABLE %s SET UNLOGGED", SQL.identifier(self._table)))
+
+    @api.model
+    def _get_limits(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        return {key.rsplit('.', 1)[1]: float(ICP.get_param(key, default)) for key, default in THROTTLE_PARAMS.items()}
+
+    @api.model
+    def _take_token(self, cr, key, burst, per_hour):
+        """ Refill the bucket of ``key`` then take one token from it
+
+        Return 0 when a token was taken, else the seconds until the bucket
+        holds one again. A rejected request leaves the bucket untouched, so
+        that retrying early does not push the next token further away. A
+        burst of 0 disables the limit.
+        """
+        if burst <= 0:
+            return 0
+        rate = per_hour / 3600.0
+        table = SQL("%s AS t", SQL.identifier(self._table))
+        refill = SQL(
+            "LEAST(%s, t.tokens + EXTRACT(EPOCH FROM (now() AT TIME ZONE 'UTC') - t.updated_at) * %s)",
+            burst, rate,
+        )
+        cr.execute(SQL(
+            "INSERT INTO %(table)s (key, tokens, updated_at) "
+            "VALUES (%(key)s, %(burst)s - 1, now() AT TIME ZONE 'UTC') "
+            "ON CONFLICT (key) DO UPDATE SET tokens = %(refill)s - 1, "
+            "updated_at = now() AT TIME ZONE 'UTC' "
+            "WHERE %(refill)s >= 1 "
+            "RETURNING 1",
+            table=table, key=key, burst=burst, refill=refill,
+        ))
+        if cr.fetchone():
+            return 0
+        if rate <= 0:
+            return THROTTLE_RETENTION_HOURS * 3600
+        cr.execute(SQL("SELECT %s FROM %s WHERE t.key = %s", refill, table, key))
+        return (1 - cr.fetchone()[0]) / rate
+
+    @api.model
+    def _return_token(self, cr, key):
+        """ Give back a token taken by a request that got rejected anyway """
+        cr.execute(SQL(
+            "UPDATE %s SET tokens = tokens + 1 WHERE key = %s",
+            SQL.identifier(self._table), key,
+        ))
+
+    @api.model
+    def _count_verdict(self, cr, verdict):
+        cr.execute(SQL(
+            "INSERT INTO %(table)s (key, tokens, updated_at) VALUES (%(key)s, 1, now() AT TIME ZONE 'UTC') "
+            "ON CONFLICT (key) DO UPDATE SET tokens = t.tokens + 1, updated_at = now() AT TIME ZONE 'UTC'",
+            table=SQL("%s AS t", SQL.identifier(self._table)),
+            key=f'stat:{verdict}',
+        ))
+
+    @api.model
+    def _claim_fingerprint(self, cr, fingerprint, window):
+        """ Record a payload fingerprint, return False if it was already
+        seen within the last ``window`` seconds """
+        if window <= 0:
+            return True
+        cr.execute(SQL(
+            "INSERT INTO %(table)s (key, updated_at) VALUES (%(key)s, now() AT TIME ZONE 'UTC') "
+            "ON CONFLICT (key) DO UPDATE SET updated_at = now() AT TIME ZONE 'UTC' "
+            "WHERE t.updated_at < (now() AT TIME ZONE 'UTC') - make_interval(secs => %(window)s) "
+            "RETURNING 1",
+            table=SQL("%s AS t", SQL.identifier(self._table)),
+            key=fingerprint, window=window,
+        ))
+        return bool(cr.fetchone())
+
+    @api.model
+    def _fingerprint(self, res_model, email, vals):
+        """ Hash of the payload, insensitive to case and whitespace """
+        normalized = {
+            key: ' '.join(str(value).lower().split())
+            for key, value in vals.items() if key != 'email'
+        }
+        digest = hashlib.sha256(json.dumps([res_model, email, normalized], sort_keys=True).encode()).hexdigest()
+        return f'dup:{digest}'
+
+    @api.model
+    def _check_submission(self, res_model, vals, remote_addr):
+        """ Return the verdict on a website submission, 'accepted',
+        'rate_limited' or 'duplicate', and the seconds to wait before
+        submitting again when it is rate limited
+
+        The fingerprint of an accepted submission is claimed in the current
+        transaction: roll it back (e.g. with a savepoint around the
+        creation) when the submission cannot be saved.
+        """
+        limits = self._get_limits()
+        email = email_normalize(vals.get('email') or '') or (vals.get('email') or '').strip().lower()
+        ip_key = f'ip:{remote_addr}'
+        with self.env.registry.cursor() as cr:
+            retry_after = self._take_token(cr, ip_key, limits['throttle_ip_burst'],
+                                           limits['throttle_ip_per_hour'])
+            if not retry_after and email:
+                retry_after = self._take_token(cr, f'email:{email}', limits['throttle_email_burst'],
+                                               limits['throttle_email_per_hour'])
+                if retry_after:
+                    self._return_token(cr, ip_key)
+            if retry_after:
+                self._count_verdict(cr, 'rate_limited')
+        if retry_after:
+            verdict = 'rate_limited'
+        elif not self._claim_fingerprint(self.env.cr, self._fingerprint(res_model, email, vals),
+                                         limits['duplicate_window']):
+            verdict = 'duplicate'
+        else:
+            verdict = 'accepted'
+        if verdict != 'rate_limited':
+            # Counted on a short transaction too: the counter rows are shared
+            # by every submission and must not stay locked until the inquiry
+            # is saved
+            with self.env.registry.cursor() as cr:
+                self._count_verdict(cr, verdict)
+        if verdict != 'accepted':
+            _logger.info("Website %s submission from %s rejected: %s", res_model, remote_addr, verdict)
+        return verdict, math.ceil(retry_after)
+
+    @api.model
+    def get_throttle_stats(self):
+        """ Accepted/rejected submission counts of all workers """
+        stats = dict.fromkeys(['accepted', 'rate_limited', 'duplicate'], 0)
+        self.env.cr.execute(SQL(
+            "SELECT key, tokens FROM %s WHERE key LIKE %s",
+            SQL.identifier(self._table), 'stat:%',
+        ))
+        stats.update((key.removeprefix('stat:'), int(count)) for key, count in self.env.cr.fetchall())
+        return stats
+
+    @api.model
+    def _cron_gc(self):
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE updated_at < (now() AT TIME ZONE 'UTC') - make_interval(hours => %s) "
+            "AND key NOT LIKE %s",
+            SQL.identifier(self._table), THROTTLE_RETENTION_HOURS, 'stat:%',
+        ))
@@ -0,0 +1,182 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+from collections import Counter
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Inquiry models rolled up into the daily statistics
+STAT_MODELS = ['partnership.inquiry', 'donation.inquiry', 'collaboration.inquiry']
+
+class InquiryDailyStat(models.Model):
+    """ Daily inquiry counts per (day, inquiry type, state, source)
+
+    Rows are append-only deltas: every create, state change and unlink of an
+    inquiry inserts +1/-1 rows instead of updating a shared counter row, so
+    concurrent submissions never wait on each other. Readers sum the deltas
+    and a cron periodically compacts them back to one row per key.
+    """
+    _name = 'inquiry.daily.stat'
+    _description = 'Inquiry Daily Statistics'
+    _order = 'day desc'
+    _log_access = False
+
+    day = fields.Date(string='Day', required=True, index=True)
+    res_model = fields.Selection([
+        ('partnership.inquiry', 'Partnership'),
+        ('donation.inquiry', 'Donation'),
+        ('collaboration.inquiry', 'Collaboration'),
+    ], string='Inquiry Type', required=True)
+    state = fields.Char(string='Status', required=True)
+    source = fields.Char(string='Source')
+    count = fields.Integer(string='Count', required=True, default=0)
+
+    def init(self):
+        # Backfill on install, when the rollup starts empty
+        self.env.cr.execute(SQL("SELECT 1 FROM %s LIMIT 1", SQL.identifier(self._table)))
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _add_deltas(self, deltas):
+        """ Insert {(day, res_model, state, source): delta} rows """
+        rows = [(key, delta) for key, delta in deltas.items() if delta]
+        if not rows:
+            return
+        self.env.cr.execute(SQL(
+            "INSERT INTO %s (day, res_model, state, source, count) VALUES %s",
+            SQL.identifier(self._table),
+            SQL(", ").join(
+                SQL("(%s, %s, %s, %s, %s)", day, res_model, state, source or '', delta)
+                for (day, res_model, state, source), delta in rows
+            ),
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _record_key(self, record, state=None):
+        return (
+            record.create_date.date(),
+            record._name,
+            state or record.state,
+            record.source or '',
+        )
+
+    @api.model
+    def _record_created(self, records):
+        deltas = Counter(self._record_key(record) for record in records)
+        self._add_deltas(deltas)
+
+    @api.model
+    def _record_unlinked(self, records):
+        deltas = Counter()
+        for record in records:
+            deltas[self._record_key(record)] -= 1
+        self._add_deltas(deltas)
+
+    @api.model
+    def _record_state_change(self, records, old_state, new_state):
+        deltas = Counter()
+        for record in records:
+            deltas[self._record_key(record, old_state)] -= 1
+            deltas[self._record_key(record, new_state)] += 1
+        self._add_deltas(deltas)
+
+    @api.model
+    def _live_counts_sql(self):
+        """ Per-key counts computed from the inquiry tables themselves """
+        return SQL(" UNION ALL ").join(
+            SQL(
+                "SELECT create_date::date AS day, %s AS res_model, state, "
+                "COALESCE(source, '') AS source, COUNT(*) AS count "
+                "FROM %s GROUP BY 1, 3, 4",
+                model, SQL.identifier(self.env[model]._table),
+            )
+            for model in STAT_MODELS
+        )
+
+    @api.model
+    def _rebuild(self):
+        """ Recompute every row from the inquiry tables """
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "LOCK TABLE %(table)s IN EXCLUSIVE MODE; "
+            "DELETE FROM %(table)s; "
+            "INSERT INTO %(table)s (day, res_model, state, source, count) %(live)s",
+            table=SQL.identifier(self._table),
+            live=self._live_counts_sql(),
+        ))
+        self.invalidate_model()
+        self.env['forms.dashboard']._invalidate_cache()
+        _logger.info("Inquiry daily statistics rebuilt")
+
+    @api.model
+    def rebuild(self):
+        """ Backfill/rebuild command, e.g. from ``odoo shell`` """
+        self.check_access('write')
+        self.sudo()._rebuild()
+        return True
+
+    @api.model
+    def _compact(self):
+        """ Merge the delta rows into one row per key """
+        self.env.cr.execute(SQL(
+            "WITH deleted AS (DELETE FROM %(table)s "
+            "RETURNING day, res_model, state, source, count) "
+            "INSERT INTO %(table)s (day, res_model, state, source, count) "
+            "SELECT day, res_model, state, source, SUM(count) FROM deleted "
+            "GROUP BY day, res_model, state, source HAVING SUM(count) <> 0",
+            table=SQL.identifier(self._table),
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def check_consistency(self):
+        """ Compare the rollup with the inquiry tables
+
+        Returns the list of mismatching keys as dicts with the rollup count
+        and the live count; an empty list means the rollup is consistent.
+        """
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "WITH rollup AS (SELECT day, res_model, state, source, SUM(count) AS count "
+            "FROM %s GROUP BY 1, 2, 3, 4), live AS (%s) "
+            "SELECT COALESCE(r.day, l.day), COALESCE(r.res_model, l.res_model), "
+            "COALESCE(r.state, l.state), COALESCE(r.source, l.source), "
+            "COALESCE(r.count, 0), COALESCE(l.count, 0) "
+            "FROM rollup r FULL OUTER JOIN live l "
+            "ON r.day = l.day AND r.res_model = l.res_model "
+            "AND r.state = l.state AND r.source = l.source "
+            "WHERE COALESCE(r.count, 0) <> COALESCE(l.count, 0)",
+            SQL.identifier(self._table), self._live_counts_sql(),
+        ))
+        return [{
+            'day': fields.Date.to_string(day),
+            'res_model': res_model,
+            'state': state,
+            'source': source,
+            'rollup_count': rollup_count,
+            'live_count': live_count,
+        } for day, res_model, state, source, rollup_count, live_count in self.env.cr.fetchall()]
+
+    @api.model
+    def _cron_compact(self):
+        self._compact()
+
+    @api.model
+    def _cron_check_consistency(self):
+        mismatches = self.check_consistency()
+        if mismatches:
+            _logger.warning("Inquiry daily statistics out of sync on %s keys, rebuilding: %s",
+                            len(mismatches), mismatches[:20])
+            self._rebuild()
+
+    @api.model
+    def _get_counts(self, res_model, day_domain):
+        """ {state: count} for one inquiry type over the given day domain """
+        groups = self.sudo()._read_group(
+            day_domain + [('res_model', '=', res_model)],
+            groupby=['state'],
+            aggregates=['count:sum'],
+        )
+        return {state: total for state, total in groups if total}
@@ -0,0 +1,18 @@
+from odoo.tools.sql import create_index
+
+# Multi-column indexes behind the dashboard queries, per inquiry table.
+# Single-column ones (date_submitted, source) are declared on the fields.
+INQUIRY_INDEXES = [
+    # status breakdown and status-filtered feeds within a date range
+    ('state_create_date', ['state', 'create_date']),
+    # date range filters, trend buckets and the keyset-paginated feed
+    ('create_date_id', ['create_date', 'id']),
+]
+
+INQUIRY_TABLES = ['partnership_inquiry', 'donation_inquiry', 'collaboration_inquiry']
+
+
+def create_inquiry_indexes(cr, table):
+    """ Create the dashboard indexes of one inquiry table if missing """
+    for suffix, columns in INQUIRY_INDEXES:
+        create_index(cr, f'{table}_{suffix}_index', table, [f'"{column}"' for column in columns])
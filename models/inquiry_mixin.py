@@ -0,0 +1,208 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+from .inquiry_reference import allocate_references
+
+class InquiryMixin(models.AbstractModel):
+    """ Fields and behaviour shared by the partnership, donation and
+    collaboration inquiries
+
+    Creation, state changes and deletion keep the reference sequence, the
+    state history, the SLA metrics, the daily statistics, the dashboard
+    cache and the live dashboards up to date. Inheriting models set
+    ``_sequence_code`` to the code of their reference sequence and
+    ``_sla_milestone_state`` (see inquiry.sla.mixin).
+    """
+    _name = 'inquiry.mixin'
+    _description = 'Inquiry'
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'inquiry.sla.mixin']
+    _rec_name = 'name'
+    _order = 'create_date desc'
+    _sequence_code = None
+
+    name = fields.Char(string='Reference', required=True, copy=False,
+                       readonly=True, default='New', tracking=True)
+
+    date_submitted = fields.Datetime(
+        string='Submission Date',
+        default=fields.Datetime.now,
+        readonly=True,
+        index=True
+    )
+
+    source = fields.Selection([
+        ('website', 'Website Form'),
+        ('direct', 'Direct Entry'),
+        ('import', 'Imported')
+    ], string='Source', default='website', readonly=True, index=True)
+
+    # Additional fields
+    color = fields.Integer(string='Color Index')
+    # Stored so that it can be filtered and sorted on; mail.activity
+    # marks it for recompute when activities are added, done or removed
+    activity_count = fields.Integer(compute='_compute_activity_count', store=True, index=True)
+
+    # Change internal_notes from Text to Html for rich text editor
+    internal_notes = fields.Html(
+        string='Internal Notes',
+        sanitize=True,
+        sanitize_attributes=False,
+        sanitize_form=False
+    )
+
+    # Add computed field to check if record is from website
+    is_website_submission = fields.Boolean(
+        compute='_compute_is_website_submission',
+        store=True
+    )
+
+    # Track state changes
+    state_history = fields.One2many('inquiry.state.history', 'res_id', string='State History',
+                                    domain=lambda self: [('res_model', '=', self._name)])
+
+    @api.depends('source')
+    def _compute_is_website_submission(self):
+        for record in self:
+            record.is_website_submission = record.source == 'website'
+
+    def _compute_activity_count(self):
+        # One grouped count for the whole recordset
+        counts = dict(self.env['mail.activity'].sudo()._read_group(
+            [('res_model', '=', self._name), ('res_id', 'in', [record.id for record in self if record.id])],
+            groupby=['res_id'],
+            aggregates=['__count'],
+        ))
+        for record in self:
+            record.activity_count = counts.get(record.id, 0)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        new_vals = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        for vals, reference in zip(new_vals, allocate_references(self.env, self._sequence_code, len(new_vals))):
+            vals['name'] = reference
+        records = super().create(vals_list)
+        self.env['inquiry.daily.stat']._record_created(records)
+        self.env['forms.dashboard']._invalidate_cache()
+        self.env['forms.dashboard']._notify_inquiries('create', records)
+        return records
+
+    @api.model
+    def _create_from_intake(self, vals_list, summary='Submitted via website'):
+        """Create inquiries from public intake or bulk imports
+
+        Tracking values, follower subscription and the creation message are
+        skipped; a single summary note per record is logged instead, in one
+        batch once all records exist.
+        """
+        records = self.with_context(tracking_disable=True).create(vals_list)
+        records = self.browse(records.ids)
+        records._message_log_batch(bodies={record.id: summary for record in records})
+        return records
+
+    def write(self, vals):
+        self.env['forms.dashboard']._invalidate_cache()
+        new_state = vals.get('state')
+        if not new_state:
+            return super().write(vals)
+        # Every state change is tracked, whether it comes from an action
+        # button, a kanban drag and drop or an import
+        changes = self._get_state_changes(new_state)
+        result = super().write(vals)
+        self._track_grouped_state_changes(changes, new_state)
+        return result
+
+    def unlink(self):
+        self.env['inquiry.daily.stat']._record_unlinked(self)
+        self.env['forms.dashboard']._notify_inquiries('unlink', self)
+        self.env['inquiry.state.history']._unlink_for(self)
+        self.env['inquiry.tombstone']._log_unlinked(self)
+        self.env['forms.dashboard']._invalidate_cache()
+        return super().unlink()
+
+    # Add method to schedule activity programmatically
+    def schedule_activity(self, activity_type_id, summary, date_deadline, user_id=None):
+        """Helper method to schedule activities"""
+        self.ensure_one()
+        activity_vals = {
+            'activity_type_id': activity_type_id,
+            'summary': summary,
+            'date_deadline': date_deadline,
+            'res_model_id': self.env['ir.model']._get(self._name).id,
+            'res_id': self.id,
+            'user_id': user_id or self.env.user.id,
+        }
+        return self.env['mail.activity'].create(activity_vals)
+
+    def action_schedule_activity(self):
+        """Open activity scheduling popup"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Schedule Activity',
+            'res_model': 'mail.activity',
+            'view_mode': 'form',
+            'target': 'new',  # Opens as popup
+            'context': {
+                'default_res_id': self.id,
+                'default_res_model': self._name,
+                'default_res_model_id': self.env['ir.model']._get(self._name).id,
+                'default_user_id': self.env.user.id,
+            }
+        }
+
+    def action_view_activities(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': f'Activities - {self.name}',
+            'res_model': 'mail.activity',
+            'view_mode': 'list,form',
+            'domain': [('res_id', '=', self.id), ('res_model', '=', self._name)],
+            'context': {
+                'default_res_id': self.id,
+                'default_res_model': self._name,
+                'default_res_model_id': self.env['ir.model']._get(self._name).id,
+                'default_user_id': self.env.user.id,
+            },
+            'target': 'current',
+        }
+
+    def _track_state_change(self, old_state, new_state, note=''):
+        self.ensure_one()
+        self._track_state_changes(old_state, new_state, note)
+
+    def _track_state_changes(self, old_state, new_state, note=''):
+        """Log the same transition for all records in one batch"""
+        self.env['inquiry.state.history']._log_transitions(self, old_state, new_state, note)
+        self._update_sla_metrics(old_state, new_state, fields.Datetime.now())
+        self.env['inquiry.daily.stat']._record_state_change(self, old_state, new_state)
+        self.env['forms.dashboard']._notify_inquiries('state', self, old_state)
+
+    def _get_state_changes(self, new_state):
+        """The records that new_state would change, grouped by current state"""
+        return self.filtered(lambda record: record.state != new_state).grouped('state')
+
+    @api.model
+    def _track_grouped_state_changes(self, changes, new_state, note=''):
+        for old_state, records in changes.items():
+            records._track_state_changes(old_state, new_state, note)
+
+    def _get_states_except(self, *states):
+        return [state for state, label in self._fields['state'].selection if state not in states]
+
+    def _apply_transition(self, from_states, new_state, error, note, body):
+        """Move all records to new_state in batch
+
+        Every record is validated before anything is written, then records
+        are written at once, tracked per source state with the given note
+        and the chatter notes are logged in a single batch.
+        """
+        if any(record.state not in from_states for record in self):
+            raise UserError(error)
+        changes = self._get_state_changes(new_state)
+        # Below write()'s own tracking, which would log the change without the note
+        super().write({'state': new_state})
+        self.env['forms.dashboard']._invalidate_cache()
+        self._track_grouped_state_changes(changes, new_state, note)
+        self._message_log_batch(bodies={record.id: body for record in self})
+        return True
@@ -0,0 +1,122 @@
+from odoo import models, fields, api, tools
+from odoo.exceptions import AccessError
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Inquiry models merged into the report: (model, type key, id offset)
+REPORT_MODELS = [
+    ('partnership.inquiry', 'partnership', 0),
+    ('donation.inquiry', 'donation', 1),
+    ('collaboration.inquiry', 'collaboration', 2),
+]
+
+class FormsInquiryReport(models.Model):
+    """ All inquiry types in one read-only model
+
+    Backed by a UNION ALL view over the three inquiry tables, so that
+    cross-type analytics are a single grouped query. With the
+    ``forms_dashboard.report_materialized`` config parameter set, the view
+    is materialized instead and refreshed by a cron, which trades
+    freshness for speed on large databases.
+    """
+    _name = 'forms.inquiry.report'
+    _description = 'Inquiry Analysis'
+    _auto = False
+    _rec_name = 'name'
+    _order = 'create_date desc'
+
+    name = fields.Char(string='Reference', readonly=True)
+    res_model = fields.Char(string='Model', readonly=True)
+    res_id = fields.Many2oneReference(string='Inquiry ID', model_field='res_model', readonly=True)
+    inquiry_type = fields.Selection([
+        ('partnership', 'Partnership'),
+        ('donation', 'Donation'),
+        ('collaboration', 'Collaboration'),
+    ], string='Type', readonly=True)
+    state = fields.Selection(selection='_get_state_selection', string='Status', readonly=True)
+    source = fields.Selection([
+        ('website', 'Website Form'),
+        ('direct', 'Direct Entry'),
+        ('import', 'Imported')
+    ], string='Source', readonly=True)
+    email = fields.Char(string='Email', readonly=True)
+    create_date = fields.Datetime(string='Created On', readonly=True)
+    date_submitted = fields.Datetime(string='Submission Date', readonly=True)
+    user_id = fields.Many2one('res.users', string='Owner', readonly=True)
+
+    @api.model
+    def _get_state_selection(self):
+        selection = {}
+        for model, inquiry_type, offset in REPORT_MODELS:
+            selection.update(self.env[model]._fields['state'].selection)
+        return list(selection.items())
+
+    @api.model
+    def _is_materialized(self):
+        return bool(self.env['ir.config_parameter'].sudo().get_param('forms_dashboard.report_materialized'))
+
+    @api.model
+    def _query(self):
+        return SQL(" UNION ALL ").join(
+            SQL(
+                "SELECT id * %s + %s AS id, name, %s AS res_model, id AS res_id, "
+                "%s AS inquiry_type, state, source, email, create_date, date_submitted, "
+                "create_uid AS user_id FROM %s",
+                len(REPORT_MODELS), offset, model, inquiry_type,
+                SQL.identifier(self.env[model]._table),
+            )
+            for model, inquiry_type, offset in REPORT_MODELS
+        )
+
+    def init(self):
+        self._create_view(self._is_materialized())
+
+    @api.model
+    def _create_view(self, materialized):
+        cr = self.env.cr
+        table = SQL.identifier(self._table)
+        cr.execute("SELECT relkind FROM pg_class WHERE relname = %s", [self._table])
+        row = cr.fetchone()
+        if row and row[0] == 'm':
+            cr.execute(SQL("DROP MATERIALIZED VIEW %s CASCADE", table))
+        else:
+            tools.drop_view_if_exists(cr, self._table)
+
+        if not materialized:
+            cr.execute(SQL("CREATE OR REPLACE VIEW %s AS (%s)", table, self._query()))
+            return
+        cr.execute(SQL("CREATE MATERIALIZED VIEW %s AS (%s)", table, self._query()))
+        # The unique index is what allows refreshing concurrently
+        cr.execute(SQL("CREATE UNIQUE INDEX %s ON %s (id)",
+                       SQL.identifier(f'{self._table}_id_index'), table))
+        cr.execute(SQL("CREATE INDEX %s ON %s (create_date)",
+                       SQL.identifier(f'{self._table}_create_date_index'), table))
+        cr.execute(SQL("CREATE INDEX %s ON %s (inquiry_type, state)",
+                       SQL.identifier(f'{self._table}_type_state_index'), table))
+
+    @api.model
+    def set_materialized(self, materialized=True):
+        """ Switch between the plain and the materialized view """
+        if not self.env.user.has_group('forms_dashboard.group_forms_dashboard_manager'):
+            raise AccessError('Only Forms Dashboard managers can change the inquiry analysis storage.')
+        self.env['ir.config_parameter'].sudo().set_param(
+            'forms_dashboard.report_materialized', '1' if materialized else False)
+        self.sudo()._create_view(materialized)
+        return True
+
+    @api.model
+    def refresh(self):
+        """ Refresh the materialized view, a no-op for the plain view """
+        if not self._is_materialized():
+            return False
+        self.env.flush_all()
+        self.env.cr.execute(SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY %s", SQL.identifier(self._table)))
+        self.invalidate_model()
+        _logger.info("Inquiry analysis refreshed")
+        return True
+
+    @api.model
+    def _cron_refresh(self):
+        self.refresh()
@@ -0,0 +1,118 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Default hours an inquiry may stay new before its SLA is breached
+DEFAULT_SLA_HOURS = 24
+
+class InquirySlaMixin(models.AbstractModel):
+    """ Stored response-time metrics of an inquiry
+
+    Filled incrementally by the state transitions, so that SLA reporting
+    reads a few stored columns instead of replaying the state history.
+    Inheriting models set ``_sla_milestone_state`` to the state that marks
+    a successful outcome (qualified, committed, approved).
+    """
+    _name = 'inquiry.sla.mixin'
+    _description = 'Inquiry SLA Metrics'
+    _sla_milestone_state = None
+
+    first_response_date = fields.Datetime(string='First Response On', readonly=True, copy=False)
+    first_response_hours = fields.Float(string='Hours to First Response', readonly=True, copy=False,
+                                        aggregator='avg')
+    milestone_date = fields.Datetime(string='Milestone Reached On', readonly=True, copy=False)
+    milestone_hours = fields.Float(string='Hours to Milestone', readonly=True, copy=False,
+                                   aggregator='avg')
+    sla_breached = fields.Boolean(string='SLA Breached', readonly=True, copy=False, index=True)
+
+    @api.model
+    def _get_sla_hours(self):
+        return float(self.env['ir.config_parameter'].sudo().get_param(
+            'forms_dashboard.sla_first_response_hours', DEFAULT_SLA_HOURS))
+
+    def _update_sla_metrics(self, old_state, new_state, date):
+        """ Record the first response and milestone reached by a transition
+
+        One UPDATE for the whole recordset, which only fills the columns
+        still empty, as recompute_sla_metrics() does.
+        """
+        first_response = old_state == 'new'
+        milestone = new_state == self._sla_milestone_state
+        if not self or not (first_response or milestone):
+            return
+        metric_fields = ['first_response_date', 'first_response_hours', 'sla_breached',
+                         'milestone_date', 'milestone_hours']
+        self.flush_recordset(metric_fields + ['create_date'])
+        hours = SQL("EXTRACT(EPOCH FROM %s - create_date) / 3600", date)
+        assignments, conditions = [], []
+        if first_response:
+            assignments += [
+                SQL("first_response_date = COALESCE(first_response_date, %s)", date),
+                SQL("first_response_hours = CASE WHEN first_response_date IS NULL "
+                    "THEN %s ELSE first_response_hours END", hours),
+                SQL("sla_breached = CASE WHEN first_response_date IS NULL "
+                    "THEN %s - create_date > %s ELSE sla_breached END",
+                    date, timedelta(hours=self._get_sla_hours())),
+            ]
+            conditions.append(SQL("first_response_date IS NULL"))
+        if milestone:
+            assignments += [
+                SQL("milestone_date = COALESCE(milestone_date, %s)", date),
+                SQL("milestone_hours = CASE WHEN milestone_date IS NULL "
+                    "THEN %s ELSE milestone_hours END", hours),
+            ]
+            conditions.append(SQL("milestone_date IS NULL"))
+        self.env.cr.execute(SQL(
+            "UPDATE %s SET %s WHERE id IN %s AND (%s)",
+            SQL.identifier(self._table),
+            SQL(", ").join(assignments),
+            tuple(self.ids),
+            SQL(" OR ").join(conditions),
+        ))
+        self.invalidate_recordset(metric_fields)
+
+    @api.model
+    def _cron_flag_sla_breaches(self):
+        """ Flag inquiries still new past the SLA """
+        limit = fields.Datetime.now() - timedelta(hours=self._get_sla_hours())
+        overdue = self.search([
+            ('state', '=', 'new'),
+            ('sla_breached', '=', False),
+            ('create_date', '<', limit),
+        ])
+        if overdue:
+            overdue.write({'sla_breached': True})
+
+    @api.model
+    def recompute_sla_metrics(self):
+        """ Rebuild every SLA metric from the state history, e.g. from ``odoo shell`` """
+        self.check_access('write')
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "UPDATE %(table)s t SET "
+            "first_response_date = h.first_response, "
+            "first_response_hours = EXTRACT(EPOCH FROM h.first_response - t.create_date) / 3600, "
+            "milestone_date = h.milestone, "
+            "milestone_hours = EXTRACT(EPOCH FROM h.milestone - t.create_date) / 3600, "
+            "sla_breached = CASE WHEN h.first_response IS NOT NULL "
+            "THEN h.first_response - t.create_date > %(sla)s "
+            "ELSE t.state = 'new' AND t.create_date < %(now)s - %(sla)s END "
+            "FROM (SELECT i.id, "
+            "MIN(s.date) FILTER (WHERE s.old_state = 'new') AS first_response, "
+            "MIN(s.date) FILTER (WHERE s.new_state = %(milestone)s) AS milestone "
+            "FROM %(table)s i LEFT JOIN inquiry_state_history s "
+            "ON s.res_model = %(model)s AND s.res_id = i.id GROUP BY i.id) h "
+            "WHERE h.id = t.id",
+            table=SQL.identifier(self._table),
+            model=self._name,
+            milestone=self._sla_milestone_state,
+            sla=timedelta(hours=self._get_sla_hours()),
+            now=fields.Datetime.now(),
+        ))
+        _logger.info("SLA metrics of %s recomputed on %s inquiries", self._name, self.env.cr.rowcount)
+        self.invalidate_model()
+        self.env['forms.dashboard']._invalidate_cache()
+        return True
@@ -1,17 +1,109 @@
-from odoo import models, fields
+from odoo import models, fields, api
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Inquiry models whose transitions are logged: (model, table)
+HISTORY_MODELS = [
+    ('partnership.inquiry', 'partnership_inquiry'),
+    ('donation.inquiry', 'donation_inquiry'),
+    ('collaboration.inquiry', 'collaboration_inquiry'),
+]
 
 class InquiryStateHistory(models.Model):
     _name = 'inquiry.state.history'
     _description = 'Inquiry State History'
-    _order = 'date desc'
+    _order = 'date desc, id desc'
 
+    res_model = fields.Selection([
+        ('partnership.inquiry', 'Partnership'),
+        ('donation.inquiry', 'Donation'),
+        ('collaboration.inquiry', 'Collaboration'),
+    ], string='Inquiry Type', required=True)
+    res_id = fields.Many2oneReference(string='Inquiry ID', model_field='res_model', required=True)
     date = fields.Datetime(string='Date', required=True)
     user_id = fields.Many2one('res.users', string='User', required=True)
-    old_state = fields.Char(string='From State')
-    new_state = fields.Char(string='To State')
+    old_state = fields.Selection(selection='_get_state_selection', string='From State')
+    new_state = fields.Selection(selection='_get_state_selection', string='To State')
     note = fields.Text(string='Note')
-    
-    # Relations to different inquiry types
-    partnership_inquiry_id = fields.Many2one('partnership.inquiry', string='Partnership Inquiry', ondelete='cascade')
-    donation_inquiry_id = fields.Many2one('donation.inquiry', string='Donation Inquiry', ondelete='cascade')
-    collaboration_inquiry_id = fields.Many2one('collaboration.inquiry', string='Collaboration Inquiry', ondelete='cascade')
\ No newline at end of file
+
+    def init(self):
+        # Per-inquiry timelines, read in order by the dwell time analytics
+        create_index(self.env.cr, 'inquiry_state_history_res_model_res_id_date_index',
+                     self._table, ['res_model', 'res_id', 'date'])
+
+    @api.model
+    def _get_state_selection(self):
+        selection = {}
+        for model, table in HISTORY_MODELS:
+            selection.update(self.env[model]._fields['state'].selection)
+        return list(selection.items())
+
+    @api.model
+    def _log_transitions(self, records, old_state, new_state, note=''):
+        """ Log the same transition for all records in one batch """
+        now = fields.Datetime.now()
+        return self.create([{
+            'res_model': records._name,
+            'res_id': record.id,
+            'date': now,
+            'user_id': self.env.user.id,
+            'old_state': old_state,
+            'new_state': new_state,
+            'note': note
+        } for record in records])
+
+    @api.model
+    def _unlink_for(self, records):
+        self.sudo().search([('res_model', '=', records._name), ('res_id', 'in', records.ids)]).unlink()
+
+    @api.model
+    def get_dwell_times(self, res_model=None, date_from=None, date_to=None):
+        """ Time spent in each state, per inquiry type
+
+        The timeline of an inquiry starts in 'new' at its creation date and
+        moves on with each history row; the time in a state is the gap to
+        the next transition, computed with LEAD() in the database. Only
+        completed stays count, and ``date_from``/``date_to`` filter on the
+        date the state was entered. Durations are returned in hours.
+        """
+        self.check_access('read')
+        selected = [
+            (model, table) for model, table in HISTORY_MODELS
+            if not res_model or model == res_model
+        ]
+        timeline = SQL(" UNION ALL ").join(
+            [
+                SQL("SELECT %s AS res_model, id AS res_id, create_date AS date, 0 AS seq, "
+                    "'new' AS state FROM %s", model, SQL.identifier(table))
+                for model, table in selected
+            ] + [
+                SQL("SELECT res_model, res_id, date, id AS seq, new_state AS state FROM %s "
+                    "WHERE res_model IN %s",
+                    SQL.identifier(self._table), tuple(model for model, table in selected)),
+            ]
+        )
+        conditions = [SQL("next_date IS NOT NULL")]
+        if date_from:
+            conditions.append(SQL("date >= %s", fields.Datetime.to_datetime(date_from)))
+        if date_to:
+            conditions.append(SQL("date <= %s", fields.Datetime.to_datetime(date_to)))
+        self.env.flush_all()
+        self.env.cr.execute(SQL(
+            "WITH timeline AS (%s), stays AS ("
+            "SELECT res_model, state, date, LEAD(date) OVER ("
+            "PARTITION BY res_model, res_id ORDER BY date, seq) AS next_date FROM timeline) "
+            "SELECT res_model, state, COUNT(*), "
+            "AVG(EXTRACT(EPOCH FROM next_date - date)) / 3600, "
+            "PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM next_date - date)) / 3600, "
+            "PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM next_date - date)) / 3600 "
+            "FROM stays WHERE %s GROUP BY res_model, state ORDER BY res_model, state",
+            timeline, SQL(" AND ").join(conditions),
+        ))
+        return [{
+            'res_model': model,
+            'state': state,
+            'count': count,
+            'avg_hours': round(float(avg), 2),
+            'median_hours': round(median, 2),
+            'p90_hours': round(p90, 2),
+        } for model, state, count, avg, median, p90 in self.env.cr.fetchall()]
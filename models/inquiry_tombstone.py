@@ -0,0 +1,49 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+from datetime import timedelta
+
+# How long deletions are remembered; older dashboard watermarks get a full reload
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+class InquiryTombstone(models.Model):
+    """ Recently deleted inquiries, for the dashboard delta sync
+
+    Deleted rows cannot be found by write_date, so unlink() leaves one row
+    here with what the dashboards need to take the inquiry out of their
+    counters and activity feed.
+    """
+    _name = 'inquiry.tombstone'
+    _description = 'Deleted Inquiry'
+    _order = 'date desc, id desc'
+    _log_access = False
+
+    res_model = fields.Selection([
+        ('partnership.inquiry', 'Partnership'),
+        ('donation.inquiry', 'Donation'),
+        ('collaboration.inquiry', 'Collaboration'),
+    ], string='Inquiry Type', required=True)
+    res_id = fields.Many2oneReference(string='Inquiry ID', model_field='res_model', required=True)
+    name = fields.Char(string='Reference')
+    state = fields.Char(string='Status')
+    record_create_date = fields.Datetime(string='Inquiry Created On', required=True)
+    date = fields.Datetime(string='Deleted On', required=True, index=True)
+
+    @api.model
+    def _log_unlinked(self, records):
+        """ Remember records about to be deleted, stamped like write_date """
+        now = self.env.cr.now()
+        return self.sudo().create([{
+            'res_model': records._name,
+            'res_id': record.id,
+            'name': record.name,
+            'state': record.state or 'new',
+            'record_create_date': record.create_date,
+            'date': now,
+        } for record in records])
+
+    @api.model
+    def _cron_gc(self):
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE date < %s",
+            SQL.identifier(self._table), self.env.cr.now() - TOMBSTONE_RETENTION,
+        ))
@@ -0,0 +1,43 @@
+from odoo import models, api
+from collections import defaultdict
+
+# Inquiry models whose stored activity_count follows their activities
+ACTIVITY_COUNT_MODELS = ['partnership.inquiry', 'donation.inquiry', 'collaboration.inquiry']
+
+class MailActivity(models.Model):
+    _inherit = 'mail.activity'
+
+    def _mark_inquiry_activity_count(self):
+        """ Schedule the recompute of activity_count on the inquiries of these activities """
+        ids_by_model = defaultdict(set)
+        for activity in self.sudo():
+            if activity.res_model in ACTIVITY_COUNT_MODELS and activity.res_id:
+                ids_by_model[activity.res_model].add(activity.res_id)
+        for model, ids in ids_by_model.items():
+            records = self.env[model].sudo().browse(ids).exists()
+            self.env.add_to_compute(records._fields['activity_count'], records)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        activities = super().create(vals_list)
+        activities._mark_inquiry_activity_count()
+        return activities
+
+    def write(self, vals):
+        moved = {'res_model', 'res_model_id', 'res_id', 'active'} & set(vals)
+        if moved:
+            self._mark_inquiry_activity_count()
+        result = super().write(vals)
+        if moved:
+            self._mark_inquiry_activity_count()
+        return result
+
+    def unlink(self):
+        inquiry_activities = self.sudo().filtered(lambda activity: activity.res_model in ACTIVITY_COUNT_MODELS)
+        inquiries = [self.env[model].sudo().browse(activities.mapped('res_id'))
+                     for model, activities in inquiry_activities.grouped('res_model').items()]
+        result = super().unlink()
+        for records in inquiries:
+            records = records.exists()
+            self.env.add_to_compute(records._fields['activity_count'], records)
+        return result
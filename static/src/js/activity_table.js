@@ -0,0 +1,291 @@
+/** @odoo-module **/
+
+import { ConnectionAbortedError } from "@web/core/network/rpc";
+import { useService } from "@web/core/utils/hooks";
+import { Component, onWillStart, onWillUpdateProps, useState, useRef } from "@odoo/owl";
+
+// Fixed row height (px) the virtual window is computed from
+const ROW_HEIGHT = 46;
+// Height (px) of the scrolling viewport
+const VIEWPORT_HEIGHT = 400;
+// Rows fetched per server page
+const PAGE_SIZE = 100;
+// Extra rows rendered above and below the viewport
+const OVERSCAN = 10;
+
+/**
+ * Activity table rendering only the rows in view
+ *
+ * Rows are fetched from forms.dashboard.get_activity_feed page by page as
+ * they scroll into view; sorting and status filtering happen server-side.
+ * Pages reached in order use the keyset cursor of the previous page, pages
+ * reached by jumping (dragging the scrollbar) fall back to an offset.
+ *
+ * Rows are kept in one sparse array indexed by their position in the feed.
+ * Changes pushed by the dashboard (the ``changes`` prop) are merged into the
+ * loaded rows without a round trip; only a filter or sort change, or a new
+ * ``version``, refetches the feed and its total.
+ */
+export class ActivityTable extends Component {
+    setup() {
+        this.orm = useService("orm");
+        this.viewportRef = useRef("viewport");
+
+        this.rowHeight = ROW_HEIGHT;
+        this.viewportHeight = VIEWPORT_HEIGHT;
+        this.rows = [];
+        this.cursors = new Map();
+        this.pending = new Set();
+        this.requests = new Set();
+        // Bumped on every reset, so that late pages of an old query are dropped
+        this.queryVersion = 0;
+        // Bumped whenever merged changes shift the rows, so that late pages
+        // fetched for the old positions are dropped too
+        this.layoutVersion = 0;
+
+        this.state = useState({
+            total: 0,
+            scrollTop: 0,
+            sort: 'newest',
+            loading: false,
+            revision: 0,
+        });
+
+        onWillStart(() => this.reset(this.props));
+        onWillUpdateProps((nextProps) => {
+            if (this.getQueryKey(nextProps) !== this.getQueryKey(this.props)
+                    || nextProps.version !== this.props.version) {
+                return this.reset(nextProps);
+            }
+            const changes = nextProps.changes;
+            if (changes && (!this.props.changes || changes.version !== this.props.changes.version)) {
+                this.applyChanges(changes.items, nextProps);
+            }
+        });
+    }
+
+    getQueryKey(props) {
+        return JSON.stringify(props.filters);
+    }
+
+    async reset(props) {
+        // Pages of the previous query are of no use anymore
+        for (const request of this.requests) {
+            request.abort();
+        }
+        this.requests = new Set();
+        this.queryVersion++;
+        this.rows = [];
+        this.cursors = new Map();
+        this.pending = new Set();
+        this.state.revision++;
+        this.state.loading = true;
+        try {
+            await this.fetchPage(0, props, true);
+        } finally {
+            this.state.loading = false;
+        }
+        this.ensureVisiblePages();
+    }
+
+    isPageLoaded(index) {
+        const end = Math.min(this.state.total, (index + 1) * PAGE_SIZE);
+        for (let position = index * PAGE_SIZE; position < end; position++) {
+            if (!this.rows[position]) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    async fetchPage(index, props = this.props, withTotal = false) {
+        if ((!withTotal && this.isPageLoaded(index)) || this.pending.has(index)) {
+            return;
+        }
+        this.pending.add(index);
+        const version = this.queryVersion;
+        const layout = this.layoutVersion;
+        const cursor = index > 0 ? this.cursors.get(index - 1) : false;
+        const request = this.orm.call(
+            "forms.dashboard",
+            "get_activity_feed",
+            [],
+            {
+                ...props.filters,
+                sort: this.state.sort,
+                limit: PAGE_SIZE,
+                cursor: cursor || false,
+                offset: cursor ? 0 : index * PAGE_SIZE,
+                with_total: withTotal,
+            }
+        );
+        if (request.abort) {
+            this.requests.add(request);
+        }
+        let shifted = false;
+        try {
+            const page = await request;
+            if (version !== this.queryVersion) {
+                return;
+            }
+            if (layout !== this.layoutVersion) {
+                // The rows moved while the page was in flight
+                shifted = true;
+                return;
+            }
+            page.items.forEach((activity, offset) => {
+                this.rows[index * PAGE_SIZE + offset] = props.formatActivity(activity);
+            });
+            this.cursors.set(index, page.next_cursor);
+            if (withTotal) {
+                this.state.total = page.total;
+            } else if (!page.next_cursor) {
+                // The last page tells the exact total for free
+                this.state.total = index * PAGE_SIZE + page.items.length;
+                this.rows.length = Math.min(this.rows.length, this.state.total);
+            }
+            this.state.revision++;
+        } catch (error) {
+            if (!(error instanceof ConnectionAbortedError)) {
+                console.error("Error loading activity page:", error);
+            }
+        } finally {
+            this.requests.delete(request);
+            if (version === this.queryVersion && layout === this.layoutVersion) {
+                this.pending.delete(index);
+            }
+        }
+        if (shifted) {
+            this.ensureVisiblePages();
+        }
+    }
+
+    /**
+     * Merge changed feed items into the loaded rows
+     *
+     * Each change is ``{activity, delta}``, where ``delta`` is 1 when the
+     * inquiry joins the feed (created, or moved into the status filter), -1
+     * when it leaves it and 0 when it only changed. Rows that are loaded are
+     * updated, removed or slotted in by date; a change falling among rows
+     * not loaded yet only resizes that gap, which is refetched by offset.
+     */
+    applyChanges(changes, props = this.props) {
+        if (this.state.loading) {
+            // The first page being fetched already reflects them
+            return;
+        }
+        let shifted = false;
+        for (const { activity, delta } of changes) {
+            const row = props.formatActivity(activity);
+            const index = this.rows.findIndex(loaded => loaded && loaded.id === row.id);
+            if (index >= 0) {
+                if (delta < 0) {
+                    this.rows.splice(index, 1);
+                    this.state.total--;
+                    shifted = true;
+                } else {
+                    this.rows[index] = row;
+                }
+                continue;
+            }
+            // Not loaded: either in a gap, or not counted in the feed at all
+            const position = this.findPosition(row);
+            const inGap = position > 0 && !this.rows[position - 1];
+            if (delta > 0) {
+                this.rows.splice(position, 0, inGap ? undefined : row);
+                this.state.total++;
+                shifted = true;
+            } else if (delta < 0 && inGap) {
+                this.rows.splice(position - 1, 1);
+                this.state.total--;
+                shifted = true;
+            }
+        }
+        if (shifted) {
+            // Page boundaries moved, so later pages are fetched by offset
+            this.layoutVersion++;
+            this.cursors = new Map();
+            this.pending = new Set();
+        }
+        this.state.revision++;
+        this.ensureVisiblePages();
+    }
+
+    findPosition(row) {
+        // Index of the first loaded row sorting after the given one
+        const newest = this.state.sort === 'newest';
+        const index = this.rows.findIndex(loaded => loaded && (newest
+            ? loaded.create_date < row.create_date
+            : loaded.create_date > row.create_date));
+        return index < 0 ? this.state.total : index;
+    }
+
+    lastVisiblePage(firstPage) {
+        const lastRow = Math.ceil((this.state.scrollTop + VIEWPORT_HEIGHT) / ROW_HEIGHT) + OVERSCAN;
+        return Math.max(firstPage, Math.floor(lastRow / PAGE_SIZE));
+    }
+
+    ensurePages(first, last) {
+        // Load pages in order so that each one can use the previous cursor
+        (async () => {
+            for (let index = first; index <= last; index++) {
+                if (index * PAGE_SIZE >= this.state.total && index > 0) {
+                    break;
+                }
+                await this.fetchPage(index);
+            }
+        })();
+    }
+
+    ensureVisiblePages() {
+        const firstRow = Math.max(0, Math.floor(this.state.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        const firstPage = Math.floor(firstRow / PAGE_SIZE);
+        this.ensurePages(firstPage, this.lastVisiblePage(firstPage));
+    }
+
+    get visibleWindow() {
+        const total = this.state.total;
+        const start = Math.max(0, Math.floor(this.state.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        const count = Math.ceil(VIEWPORT_HEIGHT / ROW_HEIGHT) + 2 * OVERSCAN;
+        const end = Math.min(total, start + count);
+        // Read by the template so that loaded pages and merged changes re-render the window
+        void this.state.revision;
+        const rows = [];
+        for (let index = start; index < end; index++) {
+            rows.push({ index, activity: this.rows[index] || null });
+        }
+        return {
+            rows,
+            top: start * ROW_HEIGHT,
+            bottom: Math.max(0, (total - end) * ROW_HEIGHT),
+        };
+    }
+
+    onScroll(ev) {
+        this.state.scrollTop = ev.target.scrollTop;
+        this.ensureVisiblePages();
+    }
+
+    toggleSort() {
+        this.state.sort = this.state.sort === 'newest' ? 'oldest' : 'newest';
+        this.state.scrollTop = 0;
+        if (this.viewportRef.el) {
+            this.viewportRef.el.scrollTop = 0;
+        }
+        this.reset(this.props);
+    }
+
+    formatState(state) {
+        const label = state.replace('_', ' ');
+        return label.charAt(0).toUpperCase() + label.slice(1);
+    }
+}
+
+ActivityTable.template = "forms_dashboard.ActivityTable";
+ActivityTable.props = {
+    filters: Object,
+    version: { type: Number, optional: true },
+    changes: { type: Object, optional: true },
+    formatActivity: Function,
+    onOpen: Function,
+};
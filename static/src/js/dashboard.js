@@ -2,19 +2,120 @@
 
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
+import { deserializeDateTime } from "@web/core/l10n/dates";
+import { loadBundle } from "@web/core/assets";
+import { ConnectionAbortedError } from "@web/core/network/rpc";
+import { useDebounced } from "@web/core/utils/timing";
 import { Component, onWillStart, useState, onMounted, useRef, onWillDestroy } from "@odoo/owl";
+import { ActivityTable } from "./activity_table";
+
+// Milliseconds a snapshot stays in the client cache
+const QUERY_CACHE_TTL = 60000;
+// Number of filter combinations kept in the client cache
+const QUERY_CACHE_SIZE = 20;
+// Milliseconds of quiet after a filter change before anything is fetched
+const FILTER_DEBOUNCE = 300;
+
+/**
+ * Snapshots of the dashboard, keyed by their normalized filters
+ *
+ * Entries expire after QUERY_CACHE_TTL and the oldest is evicted past
+ * QUERY_CACHE_SIZE. Identical requests in flight share one RPC, and a
+ * request for another key aborts the one in flight, whose response could
+ * only be stale by the time it lands.
+ */
+export class QueryCache {
+    constructor(ttl = QUERY_CACHE_TTL, size = QUERY_CACHE_SIZE) {
+        this.ttl = ttl;
+        this.size = size;
+        this.entries = new Map();
+        this.inflight = null;
+    }
+
+    static key(params) {
+        return JSON.stringify(Object.keys(params).sort().map(name => [name, params[name] || false]));
+    }
+
+    get(key) {
+        const entry = this.entries.get(key);
+        if (!entry) {
+            return undefined;
+        }
+        if (Date.now() - entry.time > this.ttl) {
+            this.entries.delete(key);
+            return undefined;
+        }
+        // Callers patch what they get with pushed events, keep the entry pristine
+        return structuredClone(entry.value);
+    }
+
+    set(key, value) {
+        this.entries.delete(key);
+        this.entries.set(key, { value: structuredClone(value), time: Date.now() });
+        if (this.entries.size > this.size) {
+            this.entries.delete(this.entries.keys().next().value);
+        }
+    }
+
+    fetch(key, request) {
+        if (this.inflight && this.inflight.key === key) {
+            return this.inflight.promise;
+        }
+        this.abort();
+        const rpc = request();
+        const promise = rpc.then((value) => {
+            this.set(key, value);
+            return value;
+        }).finally(() => {
+            if (this.inflight && this.inflight.promise === promise) {
+                this.inflight = null;
+            }
+        });
+        this.inflight = { key, rpc, promise };
+        return promise;
+    }
+
+    abort() {
+        if (this.inflight) {
+            const { rpc } = this.inflight;
+            this.inflight = null;
+            if (rpc.abort) {
+                rpc.abort();
+            }
+        }
+    }
+
+    clear() {
+        this.entries.clear();
+    }
+}
 
 export class FormsDashboard extends Component {
     setup() {
         this.action = useService("action");
         this.orm = useService("orm");
         this.notification = useService("notification");
+        this.busService = useService("bus_service");
+        this.onBusUpdate = this.onBusUpdate.bind(this);
         
         this.trendChartRef = useRef("trendChart");
         this.statusChartRef = useRef("statusChart");
 
         // Store intervals
         this.refreshInterval = null;
+
+        // Last payload returned by get_dashboard_delta
+        this.snapshot = {};
+        // Watermark of the last sync, reset by every full reload
+        this.watermark = null;
+        // Whether the activity table counts each row the bus or the delta
+        // sync moved since, by feed id
+        this.feedMembership = new Map();
+        // Snapshots of recently viewed filters, and the key currently shown
+        this.queryCache = new QueryCache();
+        this.queryKey = null;
+        // Filter handlers coalesce into one load once the user stops clicking
+        this.debouncedLoadData = useDebounced(() => this.loadData(), FILTER_DEBOUNCE);
         
         // Chart instances
         this.charts = {
@@ -30,7 +131,15 @@ export class FormsDashboard extends Component {
             donations_new: 0,
             collaborations: 0,
             collaborations_new: 0,
-            recentActivity: [],
+            sla: { threshold_hours: 0, types: {} },
+            // Bumped whenever the activity table has to refetch its pages
+            feedVersion: 0,
+            // Latest feed changes, merged by the activity table into its pages
+            feedChanges: { version: 0, items: [] },
+            // Filters of the activity table, only applied once debounced
+            activityFilters: {},
+            // Endpoint metrics of the debug panel, fetched on demand
+            metrics: null,
             loading: false,
             lastUpdate: this.formatDate(new Date()),
             dateRange: 7,
@@ -44,25 +153,25 @@ export class FormsDashboard extends Component {
         });
         
         onWillStart(async () => {
-            await this.loadData();
+            // Chart.js is fetched from Odoo's own bundle, only when the dashboard opens
+            await Promise.all([loadBundle("web.chartjs_lib"), this.loadData()]);
         });
 
-        onMounted(async () => {
-            // Ensure Chart.js is loaded
-            await this.waitForChartJs();
-            
-            // Use requestAnimationFrame to ensure DOM is ready
-            requestAnimationFrame(() => {
-                setTimeout(() => {
-                    this.initializeCharts();
-                }, 100);
-            });
-            
-            // Auto refresh every 5 minutes
-            this.refreshInterval = setInterval(() => this.refresh(), 300000);
+        onMounted(() => {
+            // Inquiry changes are pushed over the bus; polling is only a fallback
+            this.busService.subscribe("forms_dashboard/update", this.onBusUpdate);
+            this.busService.start();
+
+            // Chart.js and the canvases are both ready once mounted
+            this.initializeCharts();
+
+            // Fallback sync: a watermark check, answered "not modified" when idle
+            this.refreshInterval = setInterval(() => this.refresh(), 120000);
         });
 
         onWillDestroy(() => {
+            this.busService.unsubscribe("forms_dashboard/update", this.onBusUpdate);
+
             // Clear interval
             if (this.refreshInterval) {
                 clearInterval(this.refreshInterval);
@@ -74,21 +183,6 @@ export class FormsDashboard extends Component {
         });
     }
 
-    async waitForChartJs() {
-        let attempts = 0;
-        const maxAttempts = 50; // 5 seconds max
-        
-        while (typeof window.Chart === 'undefined' && attempts < maxAttempts) {
-            await new Promise(resolve => setTimeout(resolve, 100));
-            attempts++;
-        }
-        
-        if (typeof window.Chart === 'undefined') {
-            console.error('Chart.js not available');
-            throw new Error('Chart.js failed to load');
-        }
-    }
-
     destroyCharts() {
         if (this.charts.trend) {
             try {
@@ -156,24 +250,10 @@ export class FormsDashboard extends Component {
         return true;
     }
 
-    async initializeCharts() {
+    initializeCharts() {
         try {
-            // Check if refs are available
-            if (!this.trendChartRef.el || !this.statusChartRef.el) {
-                console.error('Chart containers not available');
-                // Retry once more after delay
-                setTimeout(() => this.initializeCharts(), 500);
-                return;
-            }
-
-            // Get initial data with date range
-            const [trendData, statusData] = await Promise.all([
-                this.getTrendData(),
-                this.getStatusDistribution()
-            ]);
-            
-            // Create charts
-            this.createCharts(trendData, statusData);
+            // Charts are drawn from the snapshot loaded in onWillStart
+            this.createCharts(this.getTrendData(), this.getStatusDistribution());
             
         } catch (error) {
             console.error('Error initializing charts:', error);
@@ -368,178 +448,71 @@ export class FormsDashboard extends Component {
         }
     }
 
-    getDateRangeDomain(days = null) {
-        if (this.state.showCustomDate && this.state.customDateFrom && this.state.customDateTo) {
-            return this.state.customDateFrom + ' 00:00:00';
-        } else if (days !== null) {
-            const date = new Date();
-            date.setDate(date.getDate() - days);
-            return date.toISOString().split('T')[0] + ' 00:00:00';
-        }
-        return null;
-    }
-
-    getDateRangeFilter() {
-        if (this.state.showCustomDate && this.state.customDateFrom && this.state.customDateTo) {
-            return [
-                ['create_date', '>=', this.state.customDateFrom + ' 00:00:00'],
-                ['create_date', '<=', this.state.customDateTo + ' 23:59:59']
-            ];
-        } else if (this.state.dateRange !== 'all') {
-            return [['create_date', '>=', this.getDateRangeDomain(this.state.dateRange)]];
-        }
-        return [];
-    }
-
-    async getTrendData() {
-        try {
-            const period = this.state.trendPeriod;
-            let days, labels;
-
+    getTrendLabels(period, buckets) {
+        // Buckets are local start dates ("YYYY-MM-DD") computed by the server
+        return buckets.map(bucket => {
+            const [year, month, day] = bucket.split('-').map(Number);
+            const d = new Date(year, month - 1, day);
             switch(period) {
-                case 'daily':
-                    days = 7;
-                    labels = Array.from({length: 7}, (_, i) => {
-                        const d = new Date();
-                        d.setDate(d.getDate() - (6 - i));
-                        return d.toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
-                    });
-                    break;
                 case 'weekly':
-                    days = 28;
-                    labels = Array.from({length: 4}, (_, i) => {
-                        const d = new Date();
-                        d.setDate(d.getDate() - (7 * (3 - i)));
-                        return `Week of ${d.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })}`;
-                    });
-                    break;
+                    return `Week of ${d.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })}`;
                 case 'monthly':
-                    days = 180;
-                    labels = Array.from({length: 6}, (_, i) => {
-                        const d = new Date();
-                        d.setMonth(d.getMonth() - (5 - i));
-                        return d.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
-                    });
-                    break;
+                    return d.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
+                default:
+                    return d.toLocaleDateString('en-US', { weekday: 'short', month: 'short', day: 'numeric' });
             }
-
-            // Apply date range filter
-            const domain = this.getDateRangeFilter();
-
-            const [partnerships, donations, collaborations] = await Promise.all([
-                this.orm.searchRead('partnership.inquiry', domain, ['create_date']),
-                this.orm.searchRead('donation.inquiry', domain, ['create_date']),
-                this.orm.searchRead('collaboration.inquiry', domain, ['create_date'])
-            ]);
-
-            return {
-                labels,
-                datasets: [
-                    { data: this.groupDataByPeriod(partnerships, period, labels.length) },
-                    { data: this.groupDataByPeriod(donations, period, labels.length) },
-                    { data: this.groupDataByPeriod(collaborations, period, labels.length) }
-                ]
-            };
-        } catch (error) {
-            console.error('Error fetching trend data:', error);
-            return {
-                labels: [],
-                datasets: [{ data: [] }, { data: [] }, { data: [] }]
-            };
-        }
+        });
     }
 
-    groupDataByPeriod(records, period, length) {
-        const data = new Array(length).fill(0);
-        const now = new Date();
-        
-        records.forEach(record => {
-            const date = new Date(record.create_date);
-            let index = -1;
+    getSnapshotFilters() {
+        return {
+            date_range: this.state.showCustomDate ? 'custom' : String(this.state.dateRange),
+            date_from: this.state.customDateFrom || false,
+            date_to: this.state.customDateTo || false,
+            status: this.state.statusFilter,
+            trend_period: this.state.trendPeriod,
+        };
+    }
 
-            switch(period) {
-                case 'daily':
-                    const dayDiff = Math.floor((now - date) / (1000 * 60 * 60 * 24));
-                    if (dayDiff >= 0 && dayDiff < 7) {
-                        index = 6 - dayDiff;
-                    }
-                    break;
-                    
-                case 'weekly':
-                    const weekDiff = Math.floor((now - date) / (1000 * 60 * 60 * 24 * 7));
-                    if (weekDiff >= 0 && weekDiff < 4) {
-                        index = 3 - weekDiff;
-                    }
-                    break;
-                    
-                case 'monthly':
-                    const monthDiff = (now.getFullYear() - date.getFullYear()) * 12 + 
-                        (now.getMonth() - date.getMonth());
-                    if (monthDiff >= 0 && monthDiff < 6) {
-                        index = 5 - monthDiff;
-                    }
-                    break;
-            }
-            
-            if (index >= 0 && index < length) {
-                data[index]++;
-            }
-        });
-        
-        return data;
+    getTrendData() {
+        const trend = this.snapshot.trend || {};
+        const series = trend.series || {};
+        return {
+            labels: this.getTrendLabels(trend.period, trend.buckets || []),
+            datasets: [
+                { data: series.partnerships || [] },
+                { data: series.donations || [] },
+                { data: series.collaborations || [] }
+            ]
+        };
     }
 
-    async getStatusDistribution() {
+    getStatusDistribution() {
         const statuses = ['new', 'in_progress', 'qualified', 'done', 'cancelled', 'declined', 'converted'];
-        
-        try {
-            // Apply date range filter
-            const domain = this.getDateRangeFilter();
-            
-            const counts = await Promise.all(
-                statuses.map(status => 
-                    Promise.all([
-                        this.orm.searchCount('partnership.inquiry', [...domain, ['state', '=', status]]),
-                        this.orm.searchCount('donation.inquiry', [...domain, ['state', '=', status]]),
-                        this.orm.searchCount('collaboration.inquiry', [...domain, ['state', '=', status]])
-                    ]).then(results => results.reduce((a, b) => a + b, 0))
-                )
-            );
-
-            return counts;
-        } catch (error) {
-            console.error('Error fetching status distribution:', error);
-            return new Array(7).fill(0);
-        }
+        const counts = this.snapshot.status || {};
+        return statuses.map(status => counts[status] || 0);
     }
 
     async onTrendPeriodChange(ev) {
         try {
             this.state.trendPeriod = ev.target.value;
-            
-            const [trendData, statusData] = await Promise.all([
-                this.getTrendData(),
-                this.getStatusDistribution()
-            ]);
-            
-            this.createCharts(trendData, statusData);
-            
+            this.debouncedLoadData();
         } catch (error) {
             console.error('Error updating trend period:', error);
         }
     }
 
-    async loadData() {
+    async loadData({ force = false } = {}) {
         this.state.loading = true;
         try {
-            await Promise.all([
-                this.loadCounts(),
-                this.loadRecentActivity()
-            ]);
+            const applied = await this.loadSnapshot(force);
+            if (!applied) {
+                return;
+            }
             
             // Update charts if they exist
             if (this.charts.trend && this.charts.status) {
-                await this.updateCharts();
+                this.updateCharts();
             }
             
             this.state.lastUpdate = this.formatDate(new Date());
@@ -550,12 +523,10 @@ export class FormsDashboard extends Component {
         }
     }
 
-    async updateCharts() {
+    updateCharts() {
         try {
-            const [trendData, statusData] = await Promise.all([
-                this.getTrendData(),
-                this.getStatusDistribution()
-            ]);
+            const trendData = this.getTrendData();
+            const statusData = this.getStatusDistribution();
 
             if (this.charts.trend) {
                 this.charts.trend.data.labels = trendData.labels;
@@ -574,108 +545,240 @@ export class FormsDashboard extends Component {
         }
     }
 
-    async loadCounts() {
-        // Apply consistent date range filter
-        const domain = this.getDateRangeFilter();
+    async loadSnapshot(force = false) {
+        // Counters, status breakdown and trend buckets in one round trip
+        const filters = this.getSnapshotFilters();
+        const key = QueryCache.key(filters);
+        this.queryKey = key;
+        this.state.activityFilters = this.getActivityFilters();
+
+        const cached = !force && this.queryCache.get(key);
+        if (cached) {
+            // Shown at once, then brought up to date by a watermark check.
+            // The activity table refetches its pages now, so they already
+            // hold what changed since the cached watermark: only the figures
+            // are brought up to date
+            this.applySnapshot(cached);
+            this.syncData({ withFeed: false });
+            return true;
+        }
+        let snapshot;
+        try {
+            snapshot = await this.queryCache.fetch(key, () => this.orm.call(
+                "forms.dashboard",
+                "get_dashboard_delta",
+                [],
+                { ...filters, watermark: null }
+            ));
+        } catch (error) {
+            if (error instanceof ConnectionAbortedError) {
+                return false;
+            }
+            throw error;
+        }
+        // A newer filter change may have landed while this one was in flight
+        if (key !== this.queryKey) {
+            return false;
+        }
+        this.applySnapshot(snapshot);
+        return true;
+    }
 
-        const [partnerships, donations, collaborations] = await Promise.all([
-            this.orm.searchCount("partnership.inquiry", domain),
-            this.orm.searchCount("donation.inquiry", domain),
-            this.orm.searchCount("collaboration.inquiry", domain)
-        ]);
+    applyFigures(payload) {
+        this.snapshot = { ...this.snapshot, status: payload.status, trend: payload.trend };
+        this.watermark = payload.watermark;
 
-        // New inquiries (last 24 hours)
-        const newDomain = [['create_date', '>=', this.getDateRangeDomain(1)]];
-        const [partnerships_new, donations_new, collaborations_new] = await Promise.all([
-            this.orm.searchCount("partnership.inquiry", newDomain),
-            this.orm.searchCount("donation.inquiry", newDomain),
-            this.orm.searchCount("collaboration.inquiry", newDomain)
-        ]);
+        const counts = payload.counts;
+        this.state.partnerships = counts.partnerships;
+        this.state.partnerships_new = counts.partnerships_new;
+        this.state.donations = counts.donations;
+        this.state.donations_new = counts.donations_new;
+        this.state.collaborations = counts.collaborations;
+        this.state.collaborations_new = counts.collaborations_new;
 
-        this.state.partnerships = partnerships;
-        this.state.partnerships_new = partnerships_new;
-        this.state.donations = donations;
-        this.state.donations_new = donations_new;
-        this.state.collaborations = collaborations;
-        this.state.collaborations_new = collaborations_new;
+        this.state.sla = payload.sla;
     }
 
-    async loadRecentActivity() {
-        try {
-            const domain = this.getDateRangeFilter();
+    applySnapshot(snapshot) {
+        this.applyFigures(snapshot);
+        this.feedMembership = new Map();
+        this.state.feedVersion++;
+    }
 
-            if (this.state.statusFilter !== 'all') {
-                domain.push(['state', '=', this.state.statusFilter]);
-            }
+    pushFeedChanges(items) {
+        if (items.length) {
+            this.state.feedChanges = { version: this.state.feedChanges.version + 1, items };
+        }
+    }
 
-            const fields = ['id', 'name', 'create_date', 'state'];
-
-            const [partnerships, donations, collaborations] = await Promise.all([
-                this.orm.searchRead(
-                    'partnership.inquiry',
-                    domain,
-                    fields,
-                    { limit: 50, order: 'create_date desc' }
-                ),
-                this.orm.searchRead(
-                    'donation.inquiry',
-                    domain,
-                    fields,
-                    { limit: 50, order: 'create_date desc' }
-                ),
-                this.orm.searchRead(
-                    'collaboration.inquiry',
-                    domain,
-                    fields,
-                    { limit: 50, order: 'create_date desc' }
-                )
-            ]);
-
-            const allActivities = [
-                ...partnerships.map(p => ({
-                    id: p.id,
-                    recordId: p.id,
-                    name: p.name || '',
-                    type: 'Partnership',
-                    model: 'partnership.inquiry',
-                    state: p.state || 'new',
-                    date: this.formatDate(new Date(p.create_date)),
-                    create_date: p.create_date,
-                })),
-                ...donations.map(d => ({
-                    id: `donation_${d.id}`,
-                    recordId: d.id,
-                    name: d.name || '',
-                    type: 'Donation',
-                    model: 'donation.inquiry',
-                    state: d.state || 'new',
-                    date: this.formatDate(new Date(d.create_date)),
-                    create_date: d.create_date,
-                })),
-                ...collaborations.map(c => ({
-                    id: `collaboration_${c.id}`,
-                    recordId: c.id,
-                    name: c.name || '',
-                    type: 'Collaboration',
-                    model: 'collaboration.inquiry',
-                    state: c.state || 'new',
-                    date: this.formatDate(new Date(c.create_date)),
-                    create_date: c.create_date,
-                }))
-            ];
-
-            this.state.recentActivity = allActivities
-                .sort((a, b) => new Date(b.create_date) - new Date(a.create_date))
-                .slice(0, 50);
+    async syncData({ withFeed = true } = {}) {
+        // Only fetch what changed since the last watermark
+        if (!this.watermark) {
+            return this.loadData({ force: true });
+        }
+        const key = this.queryKey;
+        try {
+            const delta = await this.orm.call(
+                "forms.dashboard",
+                "get_dashboard_delta",
+                [],
+                { ...this.getSnapshotFilters(), watermark: this.watermark }
+            );
+            // Answers for filters no longer shown are dropped
+            if (key !== this.queryKey) {
+                return;
+            }
+            if (delta.full) {
+                this.applySnapshot(delta);
+                this.updateCharts();
+            } else if (!delta.not_modified) {
+                this.applyFigures(delta);
+                if (withFeed) {
+                    // Rows already moved by the bus are moved from where they are now
+                    this.pushFeedChanges([...delta.changed, ...delta.removed].map(
+                        ({ matched, matches, created, ...activity }) => this.moveFeedRow(activity, matched, matches)
+                    ));
+                }
+                this.updateCharts();
+            }
+            this.watermark = delta.watermark;
+            this.state.lastUpdate = this.formatDate(new Date());
+        } catch (error) {
+            console.error("Error syncing dashboard data:", error);
+        }
+    }
 
+    async loadMetrics() {
+        try {
+            this.state.metrics = await this.orm.call("forms.dashboard", "get_endpoint_metrics", []);
         } catch (error) {
-            console.error("Error loading recent activity:", error);
-            this.state.recentActivity = [];
+            console.error("Error loading endpoint metrics:", error);
         }
     }
 
+    async resetMetrics() {
+        await this.orm.call("forms.dashboard", "reset_endpoint_metrics", []);
+        await this.loadMetrics();
+    }
+
+    formatHours(hours) {
+        if (hours === null || hours === undefined) {
+            return '-';
+        }
+        return hours < 48 ? `${hours} h` : `${Math.round(hours / 24 * 10) / 10} d`;
+    }
+
+    getActivityFilters() {
+        const { trend_period, ...filters } = this.getSnapshotFilters();
+        return filters;
+    }
+
+    formatActivity(activity) {
+        return {
+            ...activity,
+            date: this.formatDate(new Date(activity.create_date)),
+        };
+    }
+
     async refresh() {
-        await this.loadData();
+        await this.syncData();
+    }
+
+    onBusUpdate(payload) {
+        if (payload.reload) {
+            this.queryCache.clear();
+            this.loadData({ force: true });
+            return;
+        }
+        let changed = false;
+        const feedChanges = [];
+        for (const event of payload.events) {
+            if (this.applyInquiryEvent(event)) {
+                changed = true;
+                const feedChange = this.getFeedChange(event);
+                if (feedChange) {
+                    feedChanges.push(feedChange);
+                }
+            }
+        }
+        if (changed) {
+            this.pushFeedChanges(feedChanges);
+            this.updateCharts();
+            this.state.lastUpdate = this.formatDate(new Date());
+        }
+    }
+
+    isInDateRange(createDate) {
+        const filters = this.getSnapshotFilters();
+        const day = createDate.slice(0, 10);
+        if (filters.date_range === 'all') {
+            return true;
+        }
+        if (filters.date_range === 'custom') {
+            return !filters.date_from || !filters.date_to || (day >= filters.date_from && day <= filters.date_to);
+        }
+        const from = new Date();
+        from.setUTCDate(from.getUTCDate() - parseInt(filters.date_range));
+        return day >= from.toISOString().slice(0, 10);
+    }
+
+    applyInquiryEvent(event) {
+        // Apply one pushed create/state/unlink event to the counters and charts
+        if (!this.isInDateRange(event.create_date)) {
+            return false;
+        }
+        const status = this.snapshot.status || (this.snapshot.status = {});
+        const delta = { create: 1, unlink: -1 }[event.op] || 0;
+        if (delta) {
+            this.state[event.key] += delta;
+            const age = Date.now() - deserializeDateTime(event.create_date).toMillis();
+            if (age < 24 * 3600 * 1000) {
+                this.state[`${event.key}_new`] += delta;
+            }
+            status[event.state] = (status[event.state] || 0) + delta;
+            this.bumpTrend(event, delta);
+        } else if (event.op === 'state') {
+            status[event.old_state] = (status[event.old_state] || 0) - 1;
+            status[event.state] = (status[event.state] || 0) + 1;
+        }
+        return true;
+    }
+
+    getFeedChange(event) {
+        // How a pushed event moves the inquiry in or out of the filtered feed
+        const { op, key, old_state, ...activity } = event;
+        const status = this.state.activityFilters.status;
+        const matches = (state) => !status || status === 'all' || status === state;
+        const was = op !== 'create' && matches(op === 'state' ? old_state : activity.state);
+        const is = op !== 'unlink' && matches(activity.state);
+        const change = this.moveFeedRow(activity, was, is);
+        return change.delta || is ? change : null;
+    }
+
+    moveFeedRow(activity, was, is) {
+        // Where the table has the row beats where the server last saw it
+        if (this.feedMembership.has(activity.id)) {
+            was = this.feedMembership.get(activity.id);
+        }
+        this.feedMembership.set(activity.id, is);
+        return { activity, delta: is - was };
+    }
+
+    bumpTrend(event, delta) {
+        const trend = this.snapshot.trend;
+        if (!trend || !trend.series || !trend.series[event.key]) {
+            return;
+        }
+        const day = deserializeDateTime(event.create_date).setZone(trend.tz || 'UTC').toISODate();
+        let index = -1;
+        trend.buckets.forEach((start, i) => {
+            if (start <= day) {
+                index = i;
+            }
+        });
+        if (index >= 0) {
+            trend.series[event.key][index] += delta;
+        }
     }
 
     async onDateRangeChange(ev) {
@@ -710,7 +813,7 @@ export class FormsDashboard extends Component {
                     break;
             }
             
-            await this.loadData();
+            this.debouncedLoadData();
         }
     }
 
@@ -732,7 +835,7 @@ export class FormsDashboard extends Component {
         
         if (this.state.customDateFrom && this.state.customDateTo) {
             if (this.validateDateRange(this.state.customDateFrom, this.state.customDateTo)) {
-                await this.loadData();
+                this.debouncedLoadData();
             } else {
                 // Reset to previous value if validation fails
                 ev.target.value = '';
@@ -759,7 +862,7 @@ export class FormsDashboard extends Component {
         
         if (this.state.customDateFrom && this.state.customDateTo) {
             if (this.validateDateRange(this.state.customDateFrom, this.state.customDateTo)) {
-                await this.loadData();
+                this.debouncedLoadData();
             } else {
                 // Reset to previous value if validation fails
                 ev.target.value = '';
@@ -770,42 +873,23 @@ export class FormsDashboard extends Component {
 
     async onStatusChange(ev) {
         this.state.statusFilter = ev.target.value;
-        await this.loadData();
+        this.debouncedLoadData();
     }
 
-    async exportData() {
-        try {
-            const data = this.state.recentActivity;
-            const csvContent = this.convertToCSV(data);
-            const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-            const url = window.URL.createObjectURL(blob);
-            const link = document.createElement('a');
-            const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-            
-            link.href = url;
-            link.setAttribute('download', `forms-dashboard-export-${timestamp}.csv`);
-            document.body.appendChild(link);
-            link.click();
-            document.body.removeChild(link);
-            window.URL.revokeObjectURL(url);
-        } catch (error) {
-            console.error("Error exporting data:", error);
+    exportData(format = 'csv') {
+        // Every matching inquiry is streamed by the server, not just the loaded rows
+        const { trend_period, ...filters } = this.getSnapshotFilters();
+        const params = new URLSearchParams({ format });
+        for (const [key, value] of Object.entries(filters)) {
+            if (value) {
+                params.set(key, value);
+            }
         }
-    }
-
-    convertToCSV(data) {
-        const headers = ['Reference', 'Type', 'Status', 'Submission Date'];
-        const rows = data.map(item => [
-            item.name,
-            item.type,
-            item.state,
-            item.date
-        ]);
-        
-        return [
-            headers.join(','),
-            ...rows.map(row => row.map(cell => `"${cell}"`).join(','))
-        ].join('\n');
+        const link = document.createElement('a');
+        link.href = `/forms_dashboard/export?${params.toString()}`;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
     }
 
     openInquiryRecord(activity) {
@@ -837,6 +921,6 @@ export class FormsDashboard extends Component {
 }
 
 FormsDashboard.template = "forms_dashboard.MainDashboard";
-FormsDashboard.components = {};
+FormsDashboard.components = { ActivityTable };
 
 registry.category("actions").add("forms_dashboard_main", FormsDashboard);
\ No newline at end of file
@@ -0,0 +1,12 @@
+from . import test_activity_feed
+from . import test_benchmarks
+from . import test_bus_events
+from . import test_daily_stat
+from . import test_dashboard_cache
+from . import test_endpoint_metrics
+from . import test_import_api
+from . import test_inquiry_report
+from . import test_intake
+from . import test_sla
+from . import test_transitions
+from . import test_trend
@@ -0,0 +1,298 @@
+from odoo import fields
+from odoo.tests import TransactionCase
+from odoo.tools import SQL
+from contextlib import contextmanager
+from datetime import timedelta
+import json
+import logging
+import os
+import random
+import time
+
+from ..models.inquiry_reference import allocate_references
+
+_logger = logging.getLogger(__name__)
+
+# Inquiry models generated, with their share of the data and the fields
+# filled with fake text and with a random selection value
+GENERATED_MODELS = {
+    'partnership.inquiry': {
+        'weight': 45,
+        'names': ['company_name', 'contact_person'],
+        'selections': ['partnership_type', 'company_size'],
+        'pipeline': ['new', 'in_progress', 'qualified', 'converted', 'done'],
+    },
+    'donation.inquiry': {
+        'weight': 30,
+        'names': ['donor_name'],
+        'selections': ['donation_type', 'amount_range', 'recognition'],
+        'pipeline': ['new', 'in_progress', 'committed', 'received', 'done'],
+    },
+    'collaboration.inquiry': {
+        'weight': 25,
+        'names': ['institution_name', 'contact_name'],
+        'selections': ['collaboration_type', 'institution_type'],
+        'pipeline': ['new', 'in_progress', 'approved', 'active', 'done'],
+    },
+}
+
+# Weight of stopping at each step of the pipeline
+PIPELINE_DEPTH_WEIGHTS = [30, 25, 15, 10, 20]
+
+# Share of unfinished inquiries that end up cancelled or declined
+DROP_OUT_RATE = 0.15
+
+# Weight of each submission source
+SOURCE_WEIGHTS = {'website': 70, 'direct': 20, 'import': 10}
+
+# Share of open inquiries with scheduled activities, and most activities per inquiry
+ACTIVITY_RATE = 0.4
+MAX_ACTIVITIES = 3
+
+# Mean hours between two state transitions
+MEAN_TRANSITION_HOURS = 36
+
+# Rows inserted per INSERT statement
+INSERT_BATCH_SIZE = 5000
+
+# Required values of each inquiry model, for the functional tests
+INQUIRY_VALS = {
+    'partnership.inquiry': {
+        'company_name': 'Test Corp',
+        'contact_person': 'Jane Doe',
+        'email': 'jane.doe@example.com',
+        'partnership_type': 'research',
+    },
+    'donation.inquiry': {
+        'donor_name': 'John Doe',
+        'email': 'john.doe@example.com',
+        'donation_type': 'scholarship',
+    },
+    'collaboration.inquiry': {
+        'institution_name': 'Test University',
+        'contact_name': 'Alex Doe',
+        'email': 'alex.doe@example.com',
+        'collaboration_type': 'joint_prog',
+    },
+}
+
+
+class FormsDashboardCase(TransactionCase):
+    """ Base of the functional tests, creating inquiries as the back office would """
+
+    @classmethod
+    def create_inquiries(cls, model, count=1, **vals):
+        return cls.env[model].create([{**INQUIRY_VALS[model], **vals} for index in range(count)])
+
+
+class InquiryDataGenerator:
+    """ Seeded generator of inquiries, state histories and activities
+
+    Rows are inserted with plain SQL in large batches, which is what makes
+    a million inquiries practical; references come from the inquiry
+    sequences and every derived table (SLA metrics, daily statistics,
+    activity counts, is_active, the analysis view) is rebuilt afterwards
+    from what was inserted, so the database looks as if the inquiries had
+    gone through the application. The same seed always yields the same
+    data.
+    """
+
+    def __init__(self, env, seed=42, days=365):
+        self.env = env
+        self.random = random.Random(seed)
+        self.days = days
+        self.now = fields.Datetime.now()
+
+    def generate(self, size):
+        """ Create ``size`` inquiries split over the three types, return the counts """
+        counts = {}
+        weights = [spec['weight'] for spec in GENERATED_MODELS.values()]
+        total = sum(weights)
+        for model, spec in GENERATED_MODELS.items():
+            count = size * spec['weight'] // total
+            counts[model] = 0
+            while counts[model] < count:
+                batch = min(INSERT_BATCH_SIZE, count - counts[model])
+                self._generate_batch(model, spec, batch)
+                counts[model] += batch
+        self._rebuild_derived()
+        return counts
+
+    def _generate_batch(self, model, spec, count):
+        Inquiry = self.env[model]
+        references = allocate_references(self.env, model, count)
+        user_ids = self._get_user_ids()
+
+        rows, timelines = [], []
+        for reference in references:
+            create_date = self.now - timedelta(seconds=self.random.randrange(self.days * 86400))
+            timeline = self._timeline(spec['pipeline'], create_date)
+            vals = self._inquiry_vals(Inquiry, spec, reference, create_date, timeline)
+            vals['create_uid'] = vals['write_uid'] = self.random.choice(user_ids)
+            rows.append(vals)
+            timelines.append(timeline)
+
+        columns = list(rows[0])
+        ids = self._insert(Inquiry._table, columns, [[vals[column] for column in columns] for vals in rows])
+        self._insert_history(model, ids, timelines, user_ids)
+        self._insert_activities(model, ids, timelines, user_ids)
+
+    def _timeline(self, pipeline, create_date):
+        """ States the inquiry went through, with the date each was entered """
+        depth = self.random.choices(range(1, len(pipeline) + 1), weights=PIPELINE_DEPTH_WEIGHTS)[0]
+        states = pipeline[:depth]
+        if states[-1] != 'done' and self.random.random() < DROP_OUT_RATE:
+            states.append(self.random.choice(['cancelled', 'declined']))
+        timeline, date = [], create_date
+        for state in states:
+            timeline.append((state, date))
+            date = min(date + timedelta(hours=self.random.expovariate(1 / MEAN_TRANSITION_HOURS)), self.now)
+        return timeline
+
+    def _inquiry_vals(self, Inquiry, spec, reference, create_date, timeline):
+        number = reference.rsplit('/', 1)[-1]
+        source = self.random.choices(list(SOURCE_WEIGHTS), weights=list(SOURCE_WEIGHTS.values()))[0]
+        vals = {
+            'name': reference,
+            'email': f'contact.{number}.{self.random.randrange(10 ** 6)}@example.com',
+            'phone': f'+1 555 {self.random.randrange(10 ** 7):07d}',
+            'state': timeline[-1][0],
+            'source': source,
+            'is_website_submission': source == 'website',
+            'date_submitted': create_date,
+            'activity_count': 0,
+            'create_date': create_date,
+            'write_date': timeline[-1][1],
+        }
+        for name in spec['names']:
+            vals[name] = f'{Inquiry._fields[name].string} {number}'
+        for name in spec['selections']:
+            vals[name] = self.random.choice(Inquiry._fields[name].selection)[0]
+        if 'currency_id' in Inquiry._fields:
+            vals['currency_id'] = self.env.company.currency_id.id
+        if 'start_date' in Inquiry._fields:
+            # Every row of a batch must have the same columns
+            vals['start_date'] = vals['end_date'] = None
+            if timeline[-1][0] == 'active':
+                start = timeline[-1][1].date() - timedelta(days=self.random.randrange(60))
+                vals['start_date'] = start
+                vals['end_date'] = start + timedelta(days=self.random.randrange(30, 720))
+        return vals
+
+    def _insert_history(self, model, ids, timelines, user_ids):
+        rows = []
+        for res_id, timeline in zip(ids, timelines):
+            for (old_state, date), (new_state, new_date) in zip(timeline, timeline[1:]):
+                user_id = self.random.choice(user_ids)
+                rows.append([model, res_id, new_date, user_id, old_state, new_state,
+                             user_id, new_date, user_id, new_date])
+        self._insert('inquiry_state_history', [
+            'res_model', 'res_id', 'date', 'user_id', 'old_state', 'new_state',
+            'create_uid', 'create_date', 'write_uid', 'write_date',
+        ], rows)
+
+    def _insert_activities(self, model, ids, timelines, user_ids):
+        Activity = self.env['mail.activity']
+        activity_type_ids = self.env['mail.activity.type'].search([('res_model', 'in', [False, model])]).ids
+        if not activity_type_ids:
+            return
+        model_id = self.env['ir.model']._get_id(model)
+        today = fields.Date.context_today(Activity)
+        columns = ['res_model_id', 'res_model', 'res_id', 'activity_type_id', 'summary',
+                   'date_deadline', 'user_id', 'automated',
+                   'create_uid', 'create_date', 'write_uid', 'write_date']
+        if 'active' in Activity._fields and Activity._fields['active'].store:
+            columns.append('active')
+        rows = []
+        for res_id, timeline in zip(ids, timelines):
+            if timeline[-1][0] in ('done', 'cancelled', 'declined') or self.random.random() >= ACTIVITY_RATE:
+                continue
+            for index in range(self.random.randint(1, MAX_ACTIVITIES)):
+                user_id = self.random.choice(user_ids)
+                row = [model_id, model, res_id, self.random.choice(activity_type_ids), f'Follow-up {index + 1}',
+                       today + timedelta(days=self.random.randint(-10, 20)), user_id, False,
+                       user_id, self.now, user_id, self.now]
+                if len(columns) > len(row):
+                    row.append(True)
+                rows.append(row)
+        self._insert(Activity._table, columns, rows)
+
+    def _insert(self, table, columns, rows):
+        ids = []
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            ids += [row[0] for row in self.env.execute_query(SQL(
+                "INSERT INTO %s (%s) VALUES %s RETURNING id",
+                SQL.identifier(table),
+                SQL(", ").join(SQL.identifier(column) for column in columns),
+                SQL(", ").join(SQL("%s", tuple(row)) for row in rows[start:start + INSERT_BATCH_SIZE]),
+            ))]
+        return ids
+
+    def _get_user_ids(self):
+        users = self.env.ref('base.user_admin') | self.env.user
+        return users.ids
+
+    def _rebuild_derived(self):
+        """ Bring every table derived from the inquiries in line with the inserted rows """
+        env = self.env
+        env.invalidate_all()
+        for model in GENERATED_MODELS:
+            Inquiry = env[model].sudo()
+            env.cr.execute(SQL(
+                "UPDATE %(table)s t SET activity_count = c.count FROM ("
+                "SELECT res_id, COUNT(*) AS count FROM mail_activity "
+                "WHERE res_model = %(model)s GROUP BY res_id) c WHERE c.res_id = t.id",
+                table=SQL.identifier(Inquiry._table), model=model,
+            ))
+            Inquiry.recompute_sla_metrics()
+        env['collaboration.inquiry'].sudo()._cron_refresh_is_active()
+        env['inquiry.daily.stat'].sudo()._rebuild()
+        env['forms.inquiry.report'].sudo().refresh()
+        env.invalidate_all()
+
+
+class BenchmarkRecorder:
+    """ Wall time and SQL query count of named scenarios, reported as JSON """
+
+    def __init__(self, env, **metadata):
+        self.env = env
+        self.metadata = metadata
+        self.results = []
+
+    @contextmanager
+    def measure(self, scenario, items=1, **extra):
+        """ Time the block; ``items`` is the number of operations it performs """
+        cr = self.env.cr
+        self.env.flush_all()
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        self.env.flush_all()
+        wall = time.perf_counter() - start
+        self.results.append({
+            'scenario': scenario,
+            'wall_ms': round(wall * 1000, 2),
+            'queries': cr.sql_log_count - queries,
+            'items': items,
+            'items_per_second': round(items / wall, 2) if wall else None,
+            **extra,
+        })
+
+    def report(self, path=None):
+        """ Log the results, and write them to ``path`` when given """
+        payload = json.dumps({**self.metadata, 'results': self.results}, indent=2, default=str)
+        if path:
+            with open(path, 'w') as report:
+                report.write(payload)
+            _logger.info("Benchmark results written to %s", path)
+        _logger.info("Benchmark results:\n%s", payload)
+        return payload
+
+
+def get_benchmark_settings():
+    """ Size, seed and output path of a benchmark run, from the environment """
+    return {
+        'size': int(os.environ.get('FORMS_DASHBOARD_BENCH_SIZE', 10000)),
+        'seed': int(os.environ.get('FORMS_DASHBOARD_BENCH_SEED', 42)),
+        'output': os.environ.get('FORMS_DASHBOARD_BENCH_OUTPUT'),
+    }
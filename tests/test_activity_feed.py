@@ -0,0 +1,121 @@
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tools import SQL
+from datetime import timedelta
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+class TestActivityFeed(FormsDashboardCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Inquiries of two types sharing one creation date, far from any other data
+        cls.partnerships = cls.create_inquiries('partnership.inquiry', 3)
+        cls.donations = cls.create_inquiries('donation.inquiry', 2)
+        for records in (cls.partnerships, cls.donations):
+            records.flush_recordset()
+            cls.env.cr.execute(SQL(
+                "UPDATE %s SET create_date = '2001-01-01 10:00:00' WHERE id IN %s",
+                SQL.identifier(records._table), tuple(records.ids),
+            ))
+        cls.env.invalidate_all()
+        cls.domain = [('create_date', '>=', '2001-01-01'), ('create_date', '<', '2001-01-02')]
+
+    def _read_feed(self, limit, descending=True):
+        Dashboard = self.env['forms.dashboard']
+        ids, cursor = [], None
+        while True:
+            page = Dashboard._get_activity_feed(self.domain, cursor, limit, descending=descending)
+            ids += [item['id'] for item in page['items']]
+            cursor = page['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_cursor_equal_create_date(self):
+        # At equal dates, rows come by type rank then id
+        expected = [f"donations_{res_id}" for res_id in sorted(self.donations.ids, reverse=True)] \
+            + [f"partnerships_{res_id}" for res_id in sorted(self.partnerships.ids, reverse=True)]
+        self.assertEqual(self._read_feed(10), expected)
+        # Page boundaries falling between rows of the same date and type,
+        # and between two types, neither skip nor repeat a row
+        self.assertEqual(self._read_feed(2), expected)
+        self.assertEqual(self._read_feed(1), expected)
+        self.assertEqual(self._read_feed(2, descending=False), expected[::-1])
+
+    def test_cursor_matches_offset(self):
+        Dashboard = self.env['forms.dashboard']
+        by_offset = []
+        for offset in range(0, 5, 2):
+            page = Dashboard._get_activity_feed(self.domain, limit=2, offset=offset)
+            by_offset += [item['id'] for item in page['items']]
+        self.assertEqual(by_offset, self._read_feed(2))
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardDelta(FormsDashboardCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Known to the client: created two hours before its last sync
+        cls.kept, cls.moved, cls.deleted = cls.create_inquiries('partnership.inquiry', 3)
+        records = cls.kept | cls.moved | cls.deleted
+        records.flush_recordset()
+        two_hours_ago = cls.env.cr.now() - timedelta(hours=2)
+        cls.env.cr.execute(SQL(
+            "UPDATE %s SET create_date = %s, write_date = %s WHERE id IN %s",
+            SQL.identifier(records._table), two_hours_ago, two_hours_ago, tuple(records.ids),
+        ))
+        cls.env.invalidate_all()
+
+    def _delta(self, watermark, **filters):
+        return self.env['forms.dashboard'].get_dashboard_delta(watermark, date_range='all', **filters)
+
+    def _watermark(self, generation=None, age=timedelta(hours=1)):
+        # The cache generation only moves on commit, pretend it did
+        if generation is None:
+            generation = self.env['forms.dashboard']._get_cache_generation() - 1
+        return {'generation': generation,
+                'write_date': fields.Datetime.to_string(self.env.cr.now() - age)}
+
+    def test_not_modified(self):
+        generation = self.env['forms.dashboard']._get_cache_generation()
+        delta = self._delta(self._watermark(generation))
+        self.assertTrue(delta['not_modified'])
+        self.assertEqual(delta['watermark']['generation'], generation)
+
+    def test_full(self):
+        self.assertTrue(self._delta(None)['full'])
+        # Past the retention of deletions, the client reloads everything
+        self.assertTrue(self._delta(self._watermark(age=timedelta(days=2)))['full'])
+
+    def test_created_changed_removed(self):
+        created = self.create_inquiries('partnership.inquiry')
+        self.moved.write({'state': 'in_progress'})
+        deleted_id = self.deleted.id
+        self.deleted.unlink()
+
+        delta = self._delta(self._watermark(), status='new')
+        self.assertFalse(delta.get('full'))
+        changed = {item['recordId']: item for item in delta['changed']}
+        # Rows leaving the status filter are returned along with the others
+        self.assertEqual(set(changed), {created.id, self.moved.id})
+        self.assertEqual(
+            {key: changed[created.id][key] for key in ('created', 'matched', 'matches')},
+            {'created': True, 'matched': False, 'matches': True},
+        )
+        self.assertEqual(
+            {key: changed[self.moved.id][key] for key in ('created', 'matched', 'matches', 'state')},
+            {'created': False, 'matched': True, 'matches': False, 'state': 'in_progress'},
+        )
+        self.assertEqual(
+            [(item['recordId'], item['matched'], item['matches']) for item in delta['removed']],
+            [(deleted_id, True, False)],
+        )
+        # Outside the status filter, moving between states keeps the row in
+        delta = self._delta(self._watermark())
+        moved = next(item for item in delta['changed'] if item['recordId'] == self.moved.id)
+        self.assertTrue(moved['matched'] and moved['matches'])
@@ -0,0 +1,250 @@
+from odoo import SUPERUSER_ID, api
+from odoo.tests import HttpCase, TransactionCase, tagged
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+import os
+import time
+
+from .common import InquiryDataGenerator, BenchmarkRecorder, GENERATED_MODELS, get_benchmark_settings
+from ..models.dashboard_cache import dashboard_cache
+from ..models.inquiry_reference import allocate_references
+
+# Website submissions posted per intake scenario
+INTAKE_SUBMISSIONS = 200
+
+# Parallel workers of the concurrent intake and reference scenarios
+INTAKE_CLIENTS = 8
+
+# Inquiries moved per bulk transition scenario
+TRANSITION_BATCH = 1000
+
+# References drawn by the reference allocation scenarios
+REFERENCE_COUNT = 1000
+
+# Records per page of the list and kanban loads, as in the web client
+LIST_LIMIT = 80
+KANBAN_LIMIT = 40
+
+# Sample website form payloads, completed with a unique email per submission
+INTAKE_FORMS = {
+    'partnership.inquiry': {
+        'company_name': 'Benchmark Corp',
+        'contact_person': 'Jane Doe',
+        'partnership_type': 'research',
+        'company_size': 'medium',
+        'industry': 'Software',
+        'partnership_goals': 'Joint research on data pipelines',
+    },
+    'donation.inquiry': {
+        'donor_name': 'John Doe',
+        'donation_type': 'scholarship',
+        'amount_range': '5k-10k',
+        'recognition': 'public',
+        'interest_areas': 'Scholarships',
+    },
+    'collaboration.inquiry': {
+        'institution_name': 'Benchmark University',
+        'contact_name': 'Alex Doe',
+        'collaboration_type': 'joint_prog',
+        'institution_type': 'uni',
+        'country': 'Bangladesh',
+        'scope': 'Joint degree program',
+    },
+}
+
+
+@tagged('post_install', '-at_install', '-standard', 'forms_dashboard_benchmark')
+class TestFormsDashboardBenchmark(HttpCase):
+    """ Timed scenarios over a generated data set
+
+    Not part of the regular test run; select them with
+    ``--test-tags forms_dashboard_benchmark``. The data set size, seed and
+    JSON output path are read from ``FORMS_DASHBOARD_BENCH_SIZE``,
+    ``FORMS_DASHBOARD_BENCH_SEED`` and ``FORMS_DASHBOARD_BENCH_OUTPUT``.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.settings = get_benchmark_settings()
+        cls.recorder = BenchmarkRecorder(cls.env, size=cls.settings['size'], seed=cls.settings['seed'])
+        generator = InquiryDataGenerator(cls.env, seed=cls.settings['seed'])
+        start = time.perf_counter()
+        cls.recorder.metadata['generated'] = generator.generate(cls.settings['size'])
+        cls.recorder.metadata['generation_seconds'] = round(time.perf_counter() - start, 2)
+
+        # Keep the throttle on the intake path, without ever tripping it
+        ICP = cls.env['ir.config_parameter'].sudo()
+        for key in ('throttle_ip_burst', 'throttle_ip_per_hour', 'throttle_email_burst', 'throttle_email_per_hour'):
+            ICP.set_param(f'forms_dashboard.{key}', 10 ** 9)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.recorder.report(cls.settings['output'])
+        super().tearDownClass()
+
+    def _call_kw(self, model, method, args=None, kwargs=None):
+        return self.make_jsonrpc_request(f'/web/dataset/call_kw/{model}/{method}', {
+            'model': model,
+            'method': method,
+            'args': args or [],
+            'kwargs': kwargs or {},
+        })
+
+    def _view_specification(self, model, view_type):
+        """ Web client specification of the fields shown in a view """
+        Model = self.env[model]
+        arch = Model.get_views([(False, view_type)])['views'][view_type]['arch']
+        specification = {}
+        for node in etree.fromstring(arch).iter('field'):
+            field = Model._fields.get(node.get('name'))
+            if field and field.name not in specification:
+                relational = field.type == 'many2one'
+                specification[field.name] = {'fields': {'display_name': {}}} if relational else {}
+        return specification
+
+    def _load_dashboard(self):
+        """ The RPCs the dashboard client action issues when it opens """
+        filters = {'date_range': '7', 'date_from': False, 'date_to': False, 'status': 'all'}
+        snapshot = self._call_kw('forms.dashboard', 'get_dashboard_delta', kwargs={
+            **filters, 'trend_period': 'daily', 'watermark': None,
+        })
+        self._call_kw('forms.dashboard', 'get_activity_feed', kwargs={
+            **filters, 'sort': 'newest', 'limit': 100, 'cursor': False, 'offset': 0, 'with_total': True,
+        })
+        self._call_kw('forms.dashboard', 'get_dashboard_delta', kwargs={
+            **filters, 'trend_period': 'daily', 'watermark': snapshot['watermark'],
+        })
+
+    def _submit_forms(self, count, post):
+        models = list(INTAKE_FORMS)
+        for index in range(count):
+            model = models[index % len(models)]
+            post(f'/website_form/{model}', {
+                **INTAKE_FORMS[model],
+                'email': f'intake.{time.monotonic_ns()}.{index}@example.com',
+            })
+
+    def test_dashboard_load(self):
+        self.authenticate('admin', 'admin')
+        dashboard_cache.clear()
+        with self.recorder.measure('dashboard_load_cold', items=3):
+            self._load_dashboard()
+        with self.recorder.measure('dashboard_load_warm', items=3):
+            self._load_dashboard()
+
+        Dashboard = self.env['forms.dashboard']
+        dashboard_cache.clear()
+        with self.recorder.measure('dashboard_snapshot_all_time'):
+            Dashboard.get_dashboard_delta(date_range='all')
+        with self.recorder.measure('activity_feed_deep_page'):
+            Dashboard.get_activity_feed(date_range='all', limit=100, offset=self.settings['size'] // 2)
+        with self.recorder.measure('dwell_times'):
+            self.env['inquiry.state.history'].get_dwell_times()
+
+    def test_list_kanban_load(self):
+        self.authenticate('admin', 'admin')
+        for model in GENERATED_MODELS:
+            specification = self._view_specification(model, 'list')
+            with self.recorder.measure(f'list_load_{model}'):
+                self._call_kw(model, 'web_search_read', kwargs={
+                    'domain': [], 'specification': specification, 'limit': LIST_LIMIT, 'count_limit': 10001,
+                })
+
+            specification = self._view_specification(model, 'kanban')
+            with self.recorder.measure(f'kanban_load_{model}'):
+                groups = self._call_kw(model, 'web_read_group', kwargs={
+                    'domain': [], 'fields': ['state'], 'groupby': ['state'], 'lazy': True,
+                })
+                for group in groups['groups']:
+                    self._call_kw(model, 'web_search_read', kwargs={
+                        'domain': group['__domain'], 'specification': specification, 'limit': KANBAN_LIMIT,
+                    })
+
+    def test_website_intake(self):
+        with self.recorder.measure('website_intake_sync', items=INTAKE_SUBMISSIONS):
+            self._submit_forms(INTAKE_SUBMISSIONS, lambda url, data: self.url_open(url, data=data))
+
+        self.env['ir.config_parameter'].sudo().set_param('forms_dashboard.async_intake', '1')
+        with self.recorder.measure('website_intake_async', items=INTAKE_SUBMISSIONS):
+            self._submit_forms(INTAKE_SUBMISSIONS, lambda url, data: self.url_open(url, data=data))
+        with self.recorder.measure('intake_queue_process', items=INTAKE_SUBMISSIONS):
+            self.env['forms.intake.queue'].sudo().process_queue()
+
+    def test_reference_allocation(self):
+        with self.recorder.measure('reference_allocation_batch', items=REFERENCE_COUNT):
+            allocate_references(self.env, 'partnership.inquiry', REFERENCE_COUNT)
+        sequence = self.env['ir.sequence'].search([('code', '=', 'partnership.inquiry')], limit=1)
+        with self.recorder.measure('reference_allocation_one_by_one', items=REFERENCE_COUNT):
+            for i in range(REFERENCE_COUNT):
+                sequence._next()
+
+    def test_bulk_transitions(self):
+        for model in GENERATED_MODELS:
+            inquiries = self.env[model].search([('state', '=', 'new')], limit=TRANSITION_BATCH)
+            with self.recorder.measure(f'bulk_set_in_progress_{model}', items=len(inquiries)):
+                inquiries.action_set_in_progress()
+            with self.recorder.measure(f'bulk_cancel_{model}', items=len(inquiries)):
+                inquiries.action_cancel()
+
+
+@tagged('post_install', '-at_install', '-standard', 'forms_dashboard_benchmark')
+class TestConcurrentIntakeBenchmark(TransactionCase):
+    """ Website intake and reference allocation from parallel transactions
+
+    Requests of an HttpCase share the test transaction and are served one
+    at a time, so they cannot show how intake scales. Here each thread
+    opens its own cursor on the registry and commits one transaction per
+    submission, as a worker would; what the scenarios create is deleted
+    again at the end. Results go next to the main report, with a
+    ``.concurrent`` suffix.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.settings = get_benchmark_settings()
+        cls.recorder = BenchmarkRecorder(cls.env, clients=INTAKE_CLIENTS)
+        cls.created = []
+
+    @classmethod
+    def tearDownClass(cls):
+        output = cls.settings['output']
+        cls.recorder.report(output and '%s.concurrent%s' % os.path.splitext(output))
+        with cls.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            for model in INTAKE_FORMS:
+                env[model].browse([res_id for res_model, res_id in cls.created if res_model == model]).unlink()
+        super().tearDownClass()
+
+    def _run_workers(self, scenario, workers, work):
+        """ Time INTAKE_SUBMISSIONS calls of ``work(env, index)`` spread over
+        ``workers`` threads, each call in a committed transaction of its own """
+        registry = self.registry
+
+        def worker(indexes):
+            for index in indexes:
+                with registry.cursor() as cr:
+                    work(api.Environment(cr, SUPERUSER_ID, {}), index)
+
+        with self.recorder.measure(scenario, items=INTAKE_SUBMISSIONS, workers=workers):
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(worker, [range(start, INTAKE_SUBMISSIONS, workers) for start in range(workers)]))
+
+    def _create(self, env, index):
+        model = list(INTAKE_FORMS)[index % len(INTAKE_FORMS)]
+        inquiry = env[model]._create_from_intake([{
+            **INTAKE_FORMS[model],
+            'email': f'concurrent.{time.monotonic_ns()}.{index}@example.com',
+        }])
+        self.created.append((model, inquiry.id))
+
+    def test_intake_create(self):
+        self._run_workers('intake_create_serial', 1, self._create)
+        self._run_workers('intake_create_concurrent', INTAKE_CLIENTS, self._create)
+
+    def test_reference_allocation(self):
+        self._run_workers('reference_allocation_concurrent', INTAKE_CLIENTS,
+                          lambda env, index: allocate_references(env, 'partnership.inquiry', 1))
+        self._run_workers('reference_next_by_code_concurrent', INTAKE_CLIENTS,
+                          lambda env, index: env['ir.sequence'].next_by_code('partnership.inquiry'))
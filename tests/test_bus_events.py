@@ -0,0 +1,54 @@
+from odoo.tests import tagged
+from unittest.mock import patch
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+class TestBusEvents(FormsDashboardCase):
+
+    def setUp(self):
+        super().setUp()
+        self.kept = self.create_inquiries('partnership.inquiry')
+        # Only what the test does is pushed
+        self.env.cr.precommit.clear()
+
+    def _push(self):
+        """ Run the precommit hooks, return the payloads sent to the dashboards """
+        payloads = []
+
+        def sendone(bus, target, notification_type, message):
+            if notification_type == 'forms_dashboard/update':
+                payloads.append(message)
+
+        with patch.object(type(self.env['bus.bus']), '_sendone', sendone):
+            self.env.cr.precommit.run()
+        return payloads
+
+    def _rolled_back(self, function):
+        with self.assertRaises(ValueError), self.env.cr.savepoint():
+            function()
+            raise ValueError("Rolled back")
+
+    def test_rolled_back_create_and_unlink(self):
+        created = self.create_inquiries('donation.inquiry')
+        self._rolled_back(lambda: self.create_inquiries('donation.inquiry', 2))
+        self._rolled_back(self.kept.unlink)
+        [payload] = self._push()
+        self.assertEqual([(event['op'], event['recordId']) for event in payload['events']],
+                         [('create', created.id)])
+
+    def test_all_rolled_back(self):
+        self._rolled_back(lambda: self.create_inquiries('collaboration.inquiry'))
+        self.assertEqual(self._push(), [])
+
+    def test_rolled_back_state_change(self):
+        # The events cannot tell the actual state anymore: reload
+        self._rolled_back(self.kept.action_set_in_progress)
+        self.assertEqual(self._push(), [{'reload': True}])
+
+    def test_committed_state_change(self):
+        self.kept.action_set_in_progress()
+        [payload] = self._push()
+        [event] = payload['events']
+        self.assertEqual((event['op'], event['old_state'], event['state']), ('state', 'new', 'in_progress'))
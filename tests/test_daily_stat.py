@@ -0,0 +1,61 @@
+from odoo import Command
+from odoo.tests import new_test_user, tagged
+from odoo.tools import SQL
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+class TestDailyStat(FormsDashboardCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Stat = self.env['inquiry.daily.stat']
+        self.Stat._rebuild()
+
+    def test_state_changes_stay_consistent(self):
+        inquiries = self.create_inquiries('collaboration.inquiry', 3)
+        inquiries[:2].action_set_in_progress()
+        inquiries[2].action_cancel()
+        inquiries[0].action_approve()
+        self.assertEqual(self.Stat.check_consistency(), [])
+        self.Stat._compact()
+        self.assertEqual(self.Stat.check_consistency(), [])
+
+    def test_record_state_change(self):
+        inquiry = self.create_inquiries('partnership.inquiry')
+        inquiry.flush_recordset()
+        # A state change made behind the ORM's back drifts from the rollup
+        self.env.cr.execute(SQL(
+            "UPDATE %s SET state = 'in_progress' WHERE id = %s",
+            SQL.identifier(inquiry._table), inquiry.id,
+        ))
+        self.env.invalidate_all()
+        drift = self.Stat.check_consistency()
+        self.assertEqual({(line['state'], line['live_count'] - line['rollup_count']) for line in drift},
+                         {('new', -1), ('in_progress', 1)})
+        self.Stat._record_state_change(inquiry, 'new', 'in_progress')
+        self.assertEqual(self.Stat.check_consistency(), [])
+
+    def test_counts_follow_record_rules(self):
+        self.create_inquiries('partnership.inquiry', 2, source='direct')
+        self.create_inquiries('partnership.inquiry', 1, source='website')
+        group = self.env['res.groups'].create({'name': 'Direct inquiries only'})
+        self.env['ir.rule'].create({
+            'name': 'Direct partnership inquiries only',
+            'model_id': self.env['ir.model']._get_id('partnership.inquiry'),
+            'domain_force': "[('source', '=', 'direct')]",
+            'groups': [Command.link(group.id)],
+        })
+        user = new_test_user(self.env, 'restricted_dashboard_user',
+                             groups='forms_dashboard.group_forms_dashboard_user')
+        user.groups_id |= group
+
+        # The restricted user only counts what the rule lets them read
+        snapshot = self.env['forms.dashboard'].with_user(user)._compute_dashboard_snapshot(date_range='all')
+        Partnership = self.env['partnership.inquiry']
+        self.assertEqual(snapshot['counts']['partnerships'], Partnership.search_count([('source', '=', 'direct')]))
+        self.assertEqual(snapshot['counts']['partnerships'], Partnership.with_user(user).search_count([]))
+        # Others still read the rollup, which counts every inquiry
+        snapshot = self.env['forms.dashboard']._compute_dashboard_snapshot(date_range='all')
+        self.assertEqual(snapshot['counts']['partnerships'], Partnership.search_count([]))
@@ -0,0 +1,54 @@
+from odoo.tests import tagged
+
+from .common import FormsDashboardCase
+from ..models.dashboard_cache import dashboard_cache
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardCache(FormsDashboardCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The generation is bumped on a cursor of its own
+        cls.registry.enter_test_mode(cls.cr)
+        cls.addClassCleanup(cls.registry.leave_test_mode)
+
+    def setUp(self):
+        super().setUp()
+        dashboard_cache.clear()
+        self.addCleanup(dashboard_cache.clear)
+        self.Dashboard = self.env['forms.dashboard']
+        # Whatever earlier writes left pending is not part of the scenario
+        self.env.cr.postcommit.clear()
+
+    def _count(self):
+        return self.Dashboard.get_dashboard_snapshot(date_range='all')['counts']['partnerships']
+
+    def test_invalidated_after_commit(self):
+        generation = self.Dashboard._get_cache_generation()
+        count = self._count()
+        inquiries = self.create_inquiries('partnership.inquiry', 2)
+        inquiries[0].action_set_in_progress()
+        # Until commit, the figures cached under the generation still stand
+        self.assertEqual(self.Dashboard._get_cache_generation(), generation)
+        self.assertEqual(self._count(), count)
+
+        self.env.cr.postcommit.run()
+        # One bump for the whole transaction
+        self.assertEqual(self.Dashboard._get_cache_generation(), generation + 1)
+        self.assertEqual(self._count(), count + 2)
+
+    def test_kept_after_rollback(self):
+        generation = self.Dashboard._get_cache_generation()
+        self._count()
+        self.create_inquiries('partnership.inquiry')
+        # What a rollback does with the hooks of the transaction
+        self.env.cr.precommit.clear()
+        self.env.cr.postcommit.clear()
+        self.env.cr.postcommit.run()
+        self.assertEqual(self.Dashboard._get_cache_generation(), generation)
+        # The entry computed before is still served
+        hits = dashboard_cache.stats()['hits']
+        self._count()
+        self.assertEqual(dashboard_cache.stats()['hits'], hits + 1)
@@ -0,0 +1,41 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..models.endpoint_metrics import EndpointMetrics, endpoint_metrics
+
+
+@tagged('post_install', '-at_install')
+class TestEndpointMetrics(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Workers flush on a cursor of their own
+        cls.registry.enter_test_mode(cls.cr)
+        cls.addClassCleanup(cls.registry.leave_test_mode)
+
+    def setUp(self):
+        super().setUp()
+        endpoint_metrics.clear()
+        self.addCleanup(endpoint_metrics.clear)
+
+    def test_merged_over_workers(self):
+        Metric = self.env['forms.endpoint.metric']
+        Metric._reset()
+        # Two workers flush what they observed, a third still holds its call
+        for seconds, queries in ((0.004, 3), (0.3, 40)):
+            worker = EndpointMetrics()
+            worker.observe('get_activity_feed', seconds, queries, 50, False)
+            Metric._flush(worker)
+        endpoint_metrics.observe('get_activity_feed', 0.02, 7, 0, True)
+
+        [stats] = Metric._get_metrics().stats()
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['rows'], 100)
+        self.assertEqual(stats['p50_ms'], 25)
+        self.assertEqual(stats['avg_queries'], 16.7)
+        self.assertIn('forms_dashboard_request_duration_seconds_count{endpoint="get_activity_feed"} 3',
+                      Metric._get_metrics().to_prometheus())
+
+        Metric._reset()
+        self.assertEqual(Metric._get_metrics().stats(), [])
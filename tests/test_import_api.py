@@ -0,0 +1,61 @@
+from odoo import fields
+from odoo.exceptions import ValidationError
+from odoo.tests import HttpCase, new_test_user, tagged
+from datetime import timedelta
+from unittest.mock import patch
+import json
+
+from .common import INQUIRY_VALS
+from ..controllers import main
+
+
+@tagged('post_install', '-at_install')
+class TestImportApi(HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        user = new_test_user(cls.env, login='forms_api', groups='forms_dashboard.group_forms_dashboard_manager')
+        cls.api_key = cls.env['res.users.apikeys'].with_user(user)._generate(
+            None, 'Forms import', fields.Datetime.now() + timedelta(days=1))
+
+    def _import(self, **batches):
+        response = self.url_open('/forms_dashboard/api/inquiries', data=json.dumps({
+            'jsonrpc': '2.0', 'method': 'call', 'params': batches,
+        }), headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {self.api_key}'})
+        return response.json()['result']
+
+    def test_results_per_item_and_chunk(self):
+        partnership = INQUIRY_VALS['partnership.inquiry']
+        payloads = [
+            {**partnership, 'company_name': 'First Corp'},
+            {**partnership, 'company_name': ''},
+            {**partnership, 'company_name': 'Second Corp'},
+            # Passes validation, fails on create: its chunk is retried one payload at a time
+            {**partnership, 'company_name': 'Broken Corp'},
+            {**partnership, 'company_name': 'Third Corp'},
+        ]
+        Partnership = type(self.env['partnership.inquiry'])
+        create = Partnership.create
+
+        def create_or_fail(records, vals_list):
+            if any(vals.get('company_name') == 'Broken Corp' for vals in vals_list):
+                raise ValidationError('Broken payload')
+            return create(records, vals_list)
+
+        with patch.object(main, 'API_CHUNK_SIZE', 2), patch.object(Partnership, 'create', create_or_fail):
+            result = self._import(partnership=payloads, donation=['not a payload'])
+
+        results = result['partnership']
+        self.assertEqual([item['index'] for item in results], [0, 1, 2, 3, 4])
+        self.assertEqual([item['success'] for item in results], [True, False, True, False, True])
+        self.assertIn('Missing required field', results[1]['error'])
+        self.assertEqual(results[3]['error'], 'Broken payload')
+        created = self.env['partnership.inquiry'].browse([item['id'] for item in results if item['success']])
+        self.assertEqual(created.mapped('company_name'), ['First Corp', 'Second Corp', 'Third Corp'])
+        self.assertEqual(created.mapped('name'), [item['reference'] for item in results if item['success']])
+        self.assertEqual(set(created.mapped('source')), {'import'})
+        self.assertFalse(self.env['partnership.inquiry'].search([('company_name', '=', 'Broken Corp')]))
+
+        self.assertEqual(result['donation'], [{'index': 0, 'success': False, 'error': 'Payload must be an object'}])
+        self.assertEqual(result['collaboration'], [])
@@ -0,0 +1,55 @@
+from odoo.tests import tagged
+
+from .common import FormsDashboardCase
+from ..models.inquiry_report import REPORT_MODELS
+
+
+@tagged('post_install', '-at_install')
+class TestInquiryReport(FormsDashboardCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for count, (model, inquiry_type, offset) in enumerate(REPORT_MODELS, start=1):
+            cls.create_inquiries(model, count)
+
+    def _check_matches_tables(self):
+        Report = self.env['forms.inquiry.report']
+        Report.invalidate_model()
+        report_ids = set()
+        for model, inquiry_type, offset in REPORT_MODELS:
+            Inquiry = self.env[model]
+            rows = Report.search([('res_model', '=', model)])
+            # Ids are unique across types, and lead back to the inquiry
+            expected_ids = {res_id * len(REPORT_MODELS) + offset for res_id in Inquiry.search([]).ids}
+            self.assertEqual(set(rows.ids), expected_ids)
+            self.assertEqual(set(rows.mapped('inquiry_type')), {inquiry_type})
+            report_ids |= set(rows.ids)
+            for row in rows[:5]:
+                inquiry = Inquiry.browse(row.res_id)
+                self.assertEqual((row.name, row.state, row.create_date),
+                                 (inquiry.name, inquiry.state, inquiry.create_date))
+        self.assertEqual(len(report_ids), Report.search_count([]))
+        totals = dict(Report._read_group([], groupby=['inquiry_type'], aggregates=['__count']))
+        self.assertEqual(totals, {
+            inquiry_type: self.env[model].search_count([])
+            for model, inquiry_type, offset in REPORT_MODELS if self.env[model].search_count([])
+        })
+
+    def test_view(self):
+        self._check_matches_tables()
+
+    def test_materialized_view(self):
+        Report = self.env['forms.inquiry.report']
+        Report.set_materialized()
+        self._check_matches_tables()
+        # Stale until refreshed
+        inquiry = self.create_inquiries('donation.inquiry')
+        inquiry.action_set_in_progress()
+        self.env.flush_all()
+        self.assertFalse(Report.search([('res_model', '=', 'donation.inquiry'), ('res_id', '=', inquiry.id)]))
+        self.assertTrue(Report.refresh())
+        self._check_matches_tables()
+        Report.set_materialized(False)
+        self.assertFalse(Report.refresh())
+        self._check_matches_tables()
@@ -0,0 +1,108 @@
+from odoo.tests import tagged
+from unittest.mock import patch
+
+from .common import FormsDashboardCase, INQUIRY_VALS
+from ..models.forms_intake_queue import MAX_ATTEMPTS
+
+
+@tagged('post_install', '-at_install')
+class TestIntakeThrottle(FormsDashboardCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Token buckets are taken on a cursor of their own
+        cls.registry.enter_test_mode(cls.cr)
+        cls.addClassCleanup(cls.registry.leave_test_mode)
+        ICP = cls.env['ir.config_parameter'].sudo()
+        ICP.set_param('forms_dashboard.throttle_ip_burst', 3)
+        ICP.set_param('forms_dashboard.throttle_email_burst', 0)
+        ICP.set_param('forms_dashboard.duplicate_window', 600)
+
+    def _check(self, vals, remote_addr='192.0.2.1'):
+        verdict, _retry_after = self.env['forms.intake.throttle']._check_submission(
+            'partnership.inquiry', vals, remote_addr)
+        return verdict
+
+    def test_verdicts(self):
+        vals = INQUIRY_VALS['partnership.inquiry']
+        self.assertEqual(self._check(vals), 'accepted')
+        # Case and whitespace do not make a different submission
+        self.assertEqual(self._check({**vals, 'company_name': ' TEST  corp '}), 'duplicate')
+        self.assertEqual(self._check({**vals, 'company_name': 'Other Corp'}), 'accepted')
+        # The burst of 3 is used up, whatever the payload
+        self.assertEqual(self._check({**vals, 'company_name': 'Third Corp'}), 'rate_limited')
+        self.assertEqual(self._check({**vals, 'company_name': 'Third Corp'}, '192.0.2.2'), 'accepted')
+        stats = self.env['forms.intake.throttle'].get_throttle_stats()
+        self.assertEqual(stats, {'accepted': 3, 'rate_limited': 1, 'duplicate': 1})
+
+    def test_rejection_is_not_charged(self):
+        self.env['ir.config_parameter'].sudo().set_param('forms_dashboard.throttle_ip_per_hour', 30)
+        Throttle = self.env['forms.intake.throttle']
+        for index in range(3):
+            self.assertEqual(self._check({**INQUIRY_VALS['partnership.inquiry'], 'company_name': f'Corp {index}'}),
+                             'accepted')
+        # Time is frozen within the test transaction: the bucket is empty
+        # and one token comes back every 120 seconds, however often the
+        # visitor retries
+        for _attempt in range(3):
+            verdict, retry_after = Throttle._check_submission(
+                'partnership.inquiry', {**INQUIRY_VALS['partnership.inquiry'], 'company_name': 'Retry'}, '192.0.2.1')
+            self.assertEqual((verdict, retry_after), ('rate_limited', 120))
+        bucket = Throttle.search([('key', '=', 'ip:192.0.2.1')])
+        self.assertEqual(bucket.tokens, 0)
+
+    def test_failed_submission_releases_fingerprint(self):
+        vals = INQUIRY_VALS['partnership.inquiry']
+        with self.assertRaises(ValueError), self.env.cr.savepoint():
+            self.assertEqual(self._check(vals), 'accepted')
+            raise ValueError("The inquiry could not be saved")
+        # The resubmission is not mistaken for a duplicate
+        self.assertEqual(self._check(vals), 'accepted')
+
+
+@tagged('post_install', '-at_install')
+class TestIntakeQueue(FormsDashboardCase):
+
+    def test_process_queue(self):
+        Queue = self.env['forms.intake.queue']
+        jobs = Queue._enqueue('donation.inquiry', INQUIRY_VALS['donation.inquiry']) \
+            | Queue._enqueue('collaboration.inquiry', INQUIRY_VALS['collaboration.inquiry'])
+        self.assertEqual(Queue.process_queue(), 2)
+        self.assertEqual(jobs.mapped('state'), ['done', 'done'])
+        self.assertEqual(self.env['donation.inquiry'].browse(jobs[0].res_id).donor_name, 'John Doe')
+        self.assertEqual(Queue.process_queue(), 0)
+
+    def test_dead_letter(self):
+        Queue = self.env['forms.intake.queue']
+        job = Queue._enqueue('partnership.inquiry', INQUIRY_VALS['partnership.inquiry'])
+        Inquiry = type(self.env['partnership.inquiry'])
+        with patch.object(Inquiry, '_create_from_intake', side_effect=ValueError("Database hiccup")):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                self.assertEqual(Queue.process_queue(), 1, "A failed payload is only tried once per run")
+                self.assertEqual(job.attempts, attempt)
+                self.assertEqual(job.state, 'dead' if attempt == MAX_ATTEMPTS else 'failed')
+                self.assertEqual(job.error, "Database hiccup")
+                # Skip the backoff delay
+                job.write({'next_attempt': False})
+        self.assertEqual(Queue.process_queue(), 0, "Dead-letter payloads are not retried")
+        self.assertFalse(job.res_id)
+
+
+@tagged('post_install', '-at_install')
+class TestIntakeCreation(FormsDashboardCase):
+
+    def test_no_tracking(self):
+        for model, vals in INQUIRY_VALS.items():
+            records = self.env[model]._create_from_intake([vals, vals])
+            messages = self.env['mail.message'].search([('model', '=', model), ('res_id', 'in', records.ids)])
+            # Only the summary note, without tracking values or followers
+            self.assertEqual(len(messages), 2)
+            self.assertTrue(all('Submitted via website' in message.body for message in messages))
+            self.assertFalse(messages.tracking_value_ids)
+            self.assertFalse(self.env['mail.followers'].search_count([
+                ('res_model', '=', model), ('res_id', 'in', records.ids),
+            ]))
+            # Unlike a creation from the back office
+            tracked = self.create_inquiries(model)
+            self.assertTrue(self.env['mail.message'].search_count([('model', '=', model), ('res_id', '=', tracked.id)]))
@@ -0,0 +1,64 @@
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tools import SQL
+from datetime import timedelta
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+class TestSlaMetrics(FormsDashboardCase):
+
+    def setUp(self):
+        super().setUp()
+        self.env['ir.config_parameter'].sudo().set_param('forms_dashboard.sla_first_response_hours', 24)
+        self.on_time, self.late = self.create_inquiries('partnership.inquiry', 2)
+        self._set_age(self.on_time, 2)
+        self._set_age(self.late, 30)
+
+    def _set_age(self, inquiry, hours):
+        inquiry.flush_recordset()
+        self.env.cr.execute(SQL(
+            "UPDATE %s SET create_date = %s WHERE id = %s",
+            SQL.identifier(inquiry._table), fields.Datetime.now() - timedelta(hours=hours), inquiry.id,
+        ))
+        inquiry.invalidate_recordset()
+
+    def _metrics(self, inquiry):
+        return inquiry.read(['first_response_date', 'first_response_hours', 'milestone_date',
+                             'milestone_hours', 'sla_breached'])[0]
+
+    def test_first_response(self):
+        (self.on_time | self.late).action_set_in_progress()
+        self.assertAlmostEqual(self.on_time.first_response_hours, 2, delta=0.01)
+        self.assertFalse(self.on_time.sla_breached)
+        self.assertAlmostEqual(self.late.first_response_hours, 30, delta=0.01)
+        self.assertTrue(self.late.sla_breached)
+        self.assertFalse(self.on_time.milestone_date)
+
+        # Later transitions only fill the milestone
+        first_response = self._metrics(self.on_time)
+        self.on_time.action_qualify()
+        self.assertAlmostEqual(self.on_time.milestone_hours, 2, delta=0.01)
+        self.on_time.action_cancel()
+        self.on_time.action_reset_draft()
+        self.on_time.action_set_in_progress()
+        metrics = self._metrics(self.on_time)
+        for name in ('first_response_date', 'first_response_hours', 'sla_breached'):
+            self.assertEqual(metrics[name], first_response[name])
+
+        # The incremental metrics match a rebuild from the state history
+        self.env['partnership.inquiry'].recompute_sla_metrics()
+        self.assertEqual(self._metrics(self.on_time)['sla_breached'], False)
+        self.assertAlmostEqual(self._metrics(self.on_time)['first_response_hours'], 2, delta=0.01)
+        self.assertTrue(self._metrics(self.late)['sla_breached'])
+
+    def test_breach_while_new(self):
+        self.env['forms.dashboard']._cron_flag_sla_breaches()
+        self.assertTrue(self.late.sla_breached)
+        self.assertFalse(self.on_time.sla_breached)
+        self.assertFalse(self.late.first_response_date)
+        # Answering late keeps the breach and records the response time
+        self.late.action_set_in_progress()
+        self.assertTrue(self.late.sla_breached)
+        self.assertAlmostEqual(self.late.first_response_hours, 30, delta=0.01)
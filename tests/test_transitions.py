@@ -0,0 +1,43 @@
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+class TestTransitions(FormsDashboardCase):
+
+    def _get_history(self, records):
+        return self.env['inquiry.state.history'].search([
+            ('res_model', '=', records._name), ('res_id', 'in', records.ids),
+        ])
+
+    def test_batch_transition(self):
+        inquiries = self.create_inquiries('partnership.inquiry', 3)
+        inquiries.action_set_in_progress()
+        self.assertEqual(set(inquiries.mapped('state')), {'in_progress'})
+        history = self._get_history(inquiries)
+        self.assertEqual(len(history), 3, "Each record logs the transition once")
+        self.assertEqual(set(history.mapped('old_state')), {'new'})
+        self.assertEqual(set(history.mapped('note')), {'Started review process'})
+        self.assertTrue(all(inquiries.mapped('first_response_date')))
+
+    def test_mixed_state_transition(self):
+        inquiries = self.create_inquiries('partnership.inquiry', 2)
+        inquiries[0].action_set_in_progress()
+        history = self._get_history(inquiries)
+        # The new inquiry cannot be qualified, so neither is the other one
+        with self.assertRaises(UserError):
+            inquiries.action_qualify()
+        self.assertEqual(inquiries.mapped('state'), ['in_progress', 'new'])
+        self.assertEqual(self._get_history(inquiries), history)
+        self.assertFalse(any(inquiries.mapped('milestone_date')))
+
+    def test_write_tracks_state(self):
+        # A kanban drag and drop writes the state directly
+        inquiries = self.create_inquiries('donation.inquiry', 2)
+        inquiries[0].action_set_in_progress()
+        inquiries.write({'state': 'committed'})
+        history = self._get_history(inquiries).filtered(lambda line: line.new_state == 'committed')
+        self.assertEqual(sorted(history.mapped('old_state')), ['in_progress', 'new'])
+        self.assertTrue(all(inquiries.mapped('milestone_date')))
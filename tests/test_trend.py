@@ -0,0 +1,63 @@
+from odoo.tests import tagged
+from odoo.tools import SQL
+from freezegun import freeze_time
+
+from .common import FormsDashboardCase
+
+
+@tagged('post_install', '-at_install')
+@freeze_time('2024-03-04 12:00:00')
+class TestTrendSeries(FormsDashboardCase):
+    """ Buckets are cut in the requested timezone, on a Monday after a leap day """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sunday_night, cls.leap_evening, cls.march_night = cls.create_inquiries('partnership.inquiry', 3)
+        create_dates = {
+            # Sunday in UTC, already Monday in Dhaka (UTC+6)
+            cls.sunday_night: '2024-03-03 23:30:00',
+            # February in UTC, already March in Dhaka
+            cls.leap_evening: '2024-02-29 20:00:00',
+            # March in UTC, still February in New York (UTC-5)
+            cls.march_night: '2024-03-01 03:00:00',
+        }
+        cls.sunday_night.flush_recordset()
+        for record, create_date in create_dates.items():
+            cls.env.cr.execute(SQL(
+                "UPDATE %s SET create_date = %s WHERE id = %s",
+                SQL.identifier(record._table), create_date, record.id,
+            ))
+        cls.env.invalidate_all()
+        cls.domain = [('id', 'in', list(map(int, create_dates)))]
+
+    def _trend(self, trend_period, tz):
+        return self.env['forms.dashboard']._get_trend_series(self.domain, trend_period, tz=tz)
+
+    def test_daily(self):
+        trend = self._trend('daily', 'UTC')
+        self.assertEqual(trend['buckets'], ['2024-02-27', '2024-02-28', '2024-02-29', '2024-03-01',
+                                            '2024-03-02', '2024-03-03', '2024-03-04'])
+        self.assertEqual(trend['series']['partnerships'], [0, 0, 1, 1, 0, 1, 0])
+        trend = self._trend('daily', 'Asia/Dhaka')
+        self.assertEqual(trend['tz'], 'Asia/Dhaka')
+        self.assertEqual(trend['series']['partnerships'], [0, 0, 0, 2, 0, 0, 1])
+
+    def test_weekly(self):
+        # ISO weeks start on Monday
+        trend = self._trend('weekly', 'UTC')
+        self.assertEqual(trend['buckets'], ['2024-02-12', '2024-02-19', '2024-02-26', '2024-03-04'])
+        self.assertEqual(trend['series']['partnerships'], [0, 0, 3, 0])
+        trend = self._trend('weekly', 'Asia/Dhaka')
+        self.assertEqual(trend['series']['partnerships'], [0, 0, 2, 1])
+
+    def test_monthly(self):
+        trend = self._trend('monthly', 'UTC')
+        self.assertEqual(trend['buckets'], ['2023-10-01', '2023-11-01', '2023-12-01',
+                                            '2024-01-01', '2024-02-01', '2024-03-01'])
+        self.assertEqual(trend['series']['partnerships'], [0, 0, 0, 0, 1, 2])
+        self.assertEqual(self._trend('monthly', 'Asia/Dhaka')['series']['partnerships'], [0, 0, 0, 0, 0, 3])
+        self.assertEqual(self._trend('monthly', 'America/New_York')['series']['partnerships'], [0, 0, 0, 0, 2, 1])
+
+    def test_unknown_timezone(self):
+        self.assertEqual(self._trend('daily', 'Mars/Olympus_Mons')['tz'], 'UTC')